@@ -0,0 +1,81 @@
+"""Construction benchmark for DashComponent and DashFigureFactory subclasses.
+
+DashComponentBase binds the params of a subclass constructor to the
+(cached) signature of its __init__, and only falls back to reading them from
+the frame of the __init__ when that is not possible (e.g. when the __init__
+reassigns its params before calling super().__init__()). This benchmark
+builds the same classes with both ways of capturing the params, for
+classes with a growing number of params, and reports the median time per
+instance and the speedup of binding over reading the frame:
+
+    $ python benchmarks/bench_construction.py --params 1 5 20 --number 2000
+"""
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dash_oop_components.core import *
+
+
+def make_classes(n_params):
+    """returns dict of (kind, capture) to a DashComponent or DashFigureFactory subclass
+    with n_params params, where capture is 'signature' or 'frame'"""
+    params = ", ".join(f"p{i}={i}" for i in range(n_params))
+    classes = {}
+    for kind, base, extra in [("component", DashComponent, ", name=None"), ("factory", DashFigureFactory, "")]:
+        for capture in ("signature", "frame"):
+            namespace = dict(base=base)
+            exec(f"class Bench(base):\n"
+                 f"    def __init__(self, {params}{extra}):\n"
+                 f"        super().__init__()\n", namespace)
+            cls = namespace["Bench"]
+            if capture == "frame":
+                cls._param_capture = None
+            classes[(kind, capture)] = cls
+    return classes
+
+
+def _time(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def run_benchmark(n_params=5, number=2000, rounds=50):
+    """returns dict of kind to the median seconds per instance with signature binding and
+    frame reading, alternating between both for rounds rounds of number instances"""
+    classes = make_classes(n_params)
+    kwargs = {f"p{i}": -i for i in range(0, n_params, 2)}
+    results = {}
+    for kind in ("component", "factory"):
+        extra = dict(name="bench") if kind == "component" else {}
+        timings = {"signature": [], "frame": []}
+        for _ in range(rounds):
+            for capture in timings:
+                cls = classes[(kind, capture)]
+                timings[capture].append(_time(lambda: cls(**kwargs, **extra), number))
+        results[kind] = {capture: statistics.median(t) for capture, t in timings.items()}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--params", type=int, nargs="+", default=[1, 5, 20], help="numbers of params")
+    parser.add_argument("--number", type=int, default=2000, help="instances per round")
+    parser.add_argument("--rounds", type=int, default=50, help="rounds per timing (median)")
+    args = parser.parse_args()
+
+    print(f"{'params':>6}  {'kind':<10}{'signature':>12}{'frame':>12}{'speedup':>10}")
+    for n_params in args.params:
+        for kind, timings in run_benchmark(n_params, args.number, args.rounds).items():
+            print(f"{n_params:>6}  {kind:<10}{timings['signature'] * 1e6:>9.2f} us"
+                  f"{timings['frame'] * 1e6:>9.2f} us{timings['frame'] / timings['signature']:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Import-time benchmark for dash_oop_components.
+
+Imports dash (which is always needed) and dash_oop_components in fresh
+interpreters and reports the median wall time of both, and the overhead of
+dash_oop_components on top of dash. Also lists the optional heavy modules
+that got imported on startup, which should be none.
+
+usage:
+
+    $ python benchmarks/bench_import.py --runs 10 --max-overhead 0.1
+
+Exits with status 1 when the median overhead exceeds --max-overhead seconds
+or when a lazy module got imported.
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+LAZY_MODULES = ("jupyter_dash", "dash_bootstrap_components", "dill", "joblib", "pandas", "pyarrow")
+
+_SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import dash
+dash_done = time.perf_counter()
+import dash_oop_components
+done = time.perf_counter()
+print(json.dumps(dict(dash=dash_done - start, total=done - start,
+                      lazy=[m for m in {lazy} if m in sys.modules])))
+"""
+
+
+def time_import(runs=10):
+    """returns dict with the median import time of dash and of dash + dash_oop_components
+    over runs fresh interpreters, and the lazy modules that got imported"""
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _SNIPPET.format(lazy=LAZY_MODULES)],
+                             capture_output=True, text=True, check=True,
+                             cwd=Path(__file__).resolve().parent.parent)
+        results.append(json.loads(out.stdout))
+    dash_time = statistics.median(r["dash"] for r in results)
+    total_time = statistics.median(r["total"] for r in results)
+    return dict(runs=runs, dash=dash_time, total=total_time, overhead=total_time - dash_time,
+                lazy=sorted(set(m for r in results for m in r["lazy"])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters")
+    parser.add_argument("--max-overhead", type=float, default=None,
+                        help="fail when the median overhead on top of dash exceeds this (seconds)")
+    args = parser.parse_args()
+
+    result = time_import(args.runs)
+    print(f"import dash:                       {result['dash']:.3f}s (median of {args.runs})")
+    print(f"import dash + dash_oop_components: {result['total']:.3f}s")
+    print(f"dash_oop_components overhead:      {result['overhead']:.3f}s")
+    print(f"lazy modules imported on startup:  {result['lazy'] or 'none'}")
+    if result["lazy"] or (args.max_overhead is not None and result["overhead"] > args.max_overhead):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Benchmarks for component tree construction, layout and querystring round-trips.
+
+Generates a synthetic DashComponent tree with configurable depth, fan-out,
+number of querystring params per leaf and (optionally) DashComponentTabs, and
+times:
+
+- build: constructing the component tree
+- dashapp: DashApp(tree, querystrings=True) (querystring discovery, callbacks)
+- to_yaml / from_yaml: storing and loading the DashApp config
+- page_load: the page_load callback for a url with all params, through the
+  flask test client
+- update_url_state: the url update callback after changing a single param,
+  through the flask test client
+
+and reports the memory allocated by the tree plus DashApp (tracemalloc) and
+the peak RSS of the process.
+
+Results get compared to the most recent result with the same tree config
+from another version/commit stored in benchmarks/results.jsonl. With --save
+the result gets appended to that file, together with the dash_oop_components
+version and git commit. The file is not tracked, as timings are specific to
+the machine: record a baseline with --save on the commit that you want to
+compare against, then run the benchmark on your changes:
+
+    $ git checkout master && python benchmarks/bench_tree.py --depth 3 --fanout 4 --save
+    $ git checkout my-branch && python benchmarks/bench_tree.py --depth 3 --fanout 4
+
+The peak RSS does not get reported on windows.
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from pathlib import Path
+try:
+    import resource
+except ImportError: # not available on windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import dash_oop_components
+from dash_oop_components.core import *
+from dash import html, dcc
+from dash.dependencies import Input, Output
+
+RESULTS_FILE = Path(__file__).resolve().parent / "results.jsonl"
+
+
+class BenchLeaf(DashComponent):
+    def __init__(self, n_params=2, name=None):
+        super().__init__()
+
+    def layout(self, params=None):
+        return html.Div([
+            self.querystring(params)(dcc.Input)(id=f"input-{i}-" + self.name, value=i)
+                for i in range(self.n_params)] + [dcc.Graph(id="graph-" + self.name)])
+
+    def component_callbacks(self, app):
+        @app.callback(Output("graph-" + self.name, "figure"),
+                      [Input(f"input-{i}-" + self.name, "value") for i in range(self.n_params)])
+        def update_graph(*values):
+            return dict(data=[dict(type="bar", y=list(values))])
+
+
+class BenchBranch(DashComponent):
+    def __init__(self, depth=2, fanout=3, n_params=2, tabs=False, name=None):
+        super().__init__()
+        for i in range(fanout):
+            child = (BenchBranch(depth - 1, fanout, n_params, tabs) if depth > 1
+                        else BenchLeaf(n_params))
+            setattr(self, f"child{i}", child)
+        self.children = [getattr(self, f"child{i}") for i in range(fanout)]
+
+    def layout(self, params=None):
+        if self.tabs:
+            return html.Div([DashComponentTabs(id="tabs-" + self.name, tabs=self.children,
+                                               params=params, component=self)])
+        return html.Div([child.layout(params) for child in self.children])
+
+
+def _time(func, repeat):
+    """returns (median seconds, last result) of calling func repeat times"""
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def _callback_body(outputs, inputs, changed, state=()):
+    """request body for the /_dash-update-component endpoint"""
+    output_ids = [dict(id=id, property=prop) for id, prop in outputs]
+    output = (".." + "...".join(f"{id}.{prop}" for id, prop in outputs) + ".."
+                if len(outputs) > 1 else f"{outputs[0][0]}.{outputs[0][1]}")
+    return dict(output=output, outputs=output_ids if len(outputs) > 1 else output_ids[0],
+                inputs=[dict(id=id, property=prop, value=value) for id, prop, value in inputs],
+                state=[dict(id=id, property=prop, value=value) for id, prop, value in state],
+                changedPropIds=[f"{id}.{prop}" for id, prop in changed])
+
+
+def run_benchmark(depth=2, fanout=3, n_params=2, tabs=False, repeat=5):
+    """builds a synthetic tree and returns a dict with the timings (median seconds
+    over repeat runs), the number of components and params and memory usage"""
+    set_naming_mode("deterministic")
+    results = {}
+
+    results["build"], tree = _time(lambda: BenchBranch(depth, fanout, n_params, tabs, name="root"), repeat)
+
+    tracemalloc.start()
+    tree = BenchBranch(depth, fanout, n_params, tabs, name="root")
+    db = DashApp(tree, querystrings=True)
+    results["memory_bytes"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    results["dashapp"], db = _time(
+        lambda: DashApp(BenchBranch(depth, fanout, n_params, tabs, name="root"), querystrings=True), repeat)
+    registry = db.querystring_registry
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yaml_file = Path(tmpdir) / "dashboard.yaml"
+        results["to_yaml"], _ = _time(lambda: db.to_yaml(yaml_file), repeat)
+        results["from_yaml"], _ = _time(lambda: DashApp.from_yaml(yaml_file), repeat)
+
+    client = db.flask_server().test_client()
+    values = {param: "changed" if pos == 0 else pos for pos, param in enumerate(registry.params)}
+    url = "http://localhost:8050/" + encode_querystring_params_to_url(list(values), list(values.values()))
+
+    page_load = _callback_body([("page-layout", "children"), ("page-state", "data")],
+                               [("url", "href", url)], [("url", "href")],
+                               state=[("page-state", "data", None)])
+    def post(body):
+        response = client.post("/_dash-update-component", json=body)
+        assert response.status_code in (200, 204), response.status_code
+        return response
+    results["page_load"], _ = _time(lambda: post(page_load), repeat)
+
+    changed = registry.params[-1]
+    inputs = [(id, attr, values[(id, attr)]) for id, attr in registry.params]
+    output = ("url", "search") if registry.has_tab_params else ("url-delta", "data")
+    update_url = _callback_body([output], inputs, [changed])
+    results["update_url_state"], _ = _time(lambda: post(update_url), repeat)
+
+    return dict(config=dict(depth=depth, fanout=fanout, params=n_params, tabs=tabs),
+                components=len(tree._tree_components()), querystring_params=len(registry),
+                timings={k: v for k, v in results.items() if k != "memory_bytes"},
+                memory_bytes=results["memory_bytes"],
+                max_rss_bytes=_max_rss_bytes())
+
+
+def _max_rss_bytes():
+    """peak RSS of this process (ru_maxrss is in bytes on macos and in kB on linux),
+    or None when it is not available (windows)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def load_results(path=RESULTS_FILE):
+    """returns list of all stored results"""
+    if not Path(path).exists():
+        return []
+    return [json.loads(line) for line in Path(path).read_text().splitlines() if line.strip()]
+
+
+def previous_result(result, results):
+    """returns the most recent stored result with the same config from another version or commit"""
+    for old in reversed(results):
+        if (old["config"] == result["config"]
+                and (old["version"], old["commit"]) != (result["version"], result["commit"])):
+            return old
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--depth", type=int, default=2, help="number of levels of branches")
+    parser.add_argument("--fanout", type=int, default=3, help="number of children of every branch")
+    parser.add_argument("--params", type=int, default=2, help="number of querystring params per leaf")
+    parser.add_argument("--tabs", action="store_true", help="render the children of branches as tabs")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs per timing (median)")
+    parser.add_argument("--save", action="store_true", help=f"append the result to {RESULTS_FILE.name}")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.depth, args.fanout, args.params, args.tabs, args.repeat)
+    result.update(version=dash_oop_components.__version__, commit=_git_commit(),
+                  python=platform.python_version(), timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    previous = previous_result(result, load_results())
+
+    print(f"dash_oop_components {result['version']} ({result['commit']}), config: {result['config']}")
+    print(f"{result['components']} components, {result['querystring_params']} querystring params")
+    for name, seconds in result["timings"].items():
+        line = f"  {name:<18}{seconds * 1000:10.2f} ms"
+        if previous is not None and previous["timings"].get(name):
+            line += f"   {seconds / previous['timings'][name]:6.2f}x vs {previous['version']} ({previous['commit']})"
+        print(line)
+    print(f"  {'memory':<18}{result['memory_bytes'] / 2**20:10.2f} MB")
+    if result["max_rss_bytes"] is not None:
+        print(f"  {'max rss':<18}{result['max_rss_bytes'] / 2**20:10.2f} MB")
+
+    if args.save:
+        with open(RESULTS_FILE, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
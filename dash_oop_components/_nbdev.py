@@ -2,8 +2,19 @@
 
 __all__ = ["index", "modules", "custom_doc_links", "git_url"]
 
-index = {"DashComponentBase": "00_core.ipynb",
+index = {"set_naming_mode": "00_core.ipynb",
+         "DashComponentBase": "00_core.ipynb",
+         "ConfigPlan": "00_core.ipynb",
          "DashFigureFactory": "00_core.ipynb",
+         "CacheBackend": "00_core.ipynb",
+         "MemoryCacheBackend": "00_core.ipynb",
+         "DiskCacheBackend": "00_core.ipynb",
+         "SharedMemoryCacheBackend": "00_core.ipynb",
+         "set_figure_cache_backend": "00_core.ipynb",
+         "get_figure_cache_backend": "00_core.ipynb",
+         "FigureCache": "00_core.ipynb",
+         "figure_cache": "00_core.ipynb",
+         "CallbackProfiler": "00_core.ipynb",
          "DashComponent": "00_core.ipynb",
          "DashComponentTabs": "00_core.ipynb",
          "DashConnector": "00_core.ipynb",
@@ -12,11 +23,34 @@ index = {"DashComponentBase": "00_core.ipynb",
          "parse_url_to_qs_and_vals": "00_core.ipynb",
          "encode_querystring_params_to_url": "00_core.ipynb",
          "update_url_with_new_params": "00_core.ipynb",
+         "LayoutTemplate": "00_core.ipynb",
+         "QuerystringRegistry": "00_core.ipynb",
          "DashApp": "00_core.ipynb",
-         "dashapp": "01_cli.ipynb"}
+         "dashapp": "01_cli.ipynb",
+         "run_dashboard": "01_cli.ipynb",
+         "serve_dashboard": "01_cli.ipynb",
+         "MAX_QUERYSTRING_LENGTH": "05_querystring_codec.ipynb",
+         "MAX_LIST_DEPTH": "05_querystring_codec.ipynb",
+         "encode_value": "05_querystring_codec.ipynb",
+         "decode_value": "05_querystring_codec.ipynb",
+         "encode_querystring": "05_querystring_codec.ipynb",
+         "decode_querystring": "05_querystring_codec.ipynb",
+         "clear_querystring_cache": "05_querystring_codec.ipynb",
+         "UrlState": "05_querystring_codec.ipynb",
+         "encode_querystring_delta": "05_querystring_codec.ipynb",
+         "clientside_querystring_js": "05_querystring_codec.ipynb",
+         "MERGE_QUERYSTRING_JS": "05_querystring_codec.ipynb",
+         "register_post_fork_hook": "06_wsgi.ipynb",
+         "run_post_fork_hooks": "06_wsgi.ipynb",
+         "load_dashboard": "06_wsgi.ipynb",
+         "warmup_dashboard": "06_wsgi.ipynb",
+         "reinit_after_fork": "06_wsgi.ipynb",
+         "create_app": "06_wsgi.ipynb"}
 
 modules = ["core.py",
-           "cli.py"]
+           "cli.py",
+           "querystring_codec.py",
+           "wsgi.py"]
 
 doc_url = "https://oegedijk.github.io/dash_oop_components/"
 
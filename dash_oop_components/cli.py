@@ -1,21 +1,65 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: 01_cli.ipynb (unless otherwise specified).
 
-__all__ = ['dashapp']
+__all__ = ['dashapp', 'run_dashboard', 'serve_dashboard']
 
 # Cell
 from .core import *
+from .core import _load_config, _CONFIG_SUFFIXES
+from .wsgi import create_app, load_dashboard
 
 # Cell
 
 import os
 import webbrowser
+import functools
 from pathlib import Path
 import click
 
 # Cell
 
+class _DefaultRunGroup(click.Group):
+    """click group that invokes the `run` command when the first argument
+    is not a subcommand, so that `dashapp dashboard.yaml` keeps working."""
+    def parse_args(self, ctx, args):
+        if not args or (args[0] not in self.commands and args[0] not in ctx.help_option_names):
+            args = ["run"] + list(args)
+        return super().parse_args(ctx, args)
 
-@click.command()
+
+@click.group(cls=_DefaultRunGroup)
+def dashapp():
+    """
+    dashapp is a CLI tool from the dash_oop_components library, used to launch a dash app from the commandline.
+
+    \b
+        $ dashapp dashboard.yaml         # development server (same as `dashapp run`)
+        $ dashapp serve dashboard.yaml   # multi-worker production server
+
+    See `dashapp run --help` and `dashapp serve --help` for the options.
+    """
+
+
+def _find_dashboard_yaml(dashboard_yaml):
+    """returns dashboard_yaml, or the default dashboard.yaml or dashboard_component.yaml
+    in the current directory when None. Returns None (after echoing why) when not found."""
+    if dashboard_yaml is None:
+        if (Path().cwd() / "dashboard.yaml").exists():
+            dashboard_yaml = Path().cwd() / "dashboard.yaml"
+        elif (Path().cwd() / "dashboard_component.yaml").exists():
+            dashboard_yaml = Path().cwd() / "dashboard_component.yaml"
+        else:
+            click.echo("No argument given and could find neither a "
+                    "default filename dashboard.yaml or dashboard_component.yaml."
+                    "Try `dashapp --help` for options. Aborting.")
+            return
+
+    if not str(dashboard_yaml).endswith(_CONFIG_SUFFIXES):
+        click.echo("you need to pass a .yaml (or .json or .msgpack) file to start a dashboard! Aborting.")
+        return
+    return dashboard_yaml
+
+
+@dashapp.command("run")
 @click.argument("dashboard_yaml", nargs=1, required=False)
 @click.option("--no-browser", "-nb", "no_browser", is_flag=True,
                  help="Launch a dashboard, but do not launch a browser.")
@@ -29,9 +73,9 @@ import click
                  help="include default bootstrap css")
 @click.option("--port", "-p", "port", default=None, type=click.INT,
                 help="specific port to run dashboard on")
-def dashapp(dashboard_yaml, no_browser, try_pickles, force_pickles, querystrings, bootstrap, port):
+def run_dashboard(dashboard_yaml, no_browser, try_pickles, force_pickles, querystrings, bootstrap, port):
     """
-    dashapp is a CLI tool from the dash_oop_components library, used to launch a dash app from the commandline.
+    Launch a dash app with the (single-threaded) development server.
 
     You first need to store your dash app to a config yaml file using e.g
 
@@ -68,19 +112,8 @@ def dashapp(dashboard_yaml, no_browser, try_pickles, force_pickles, querystrings
 
         $ dashapp
     """
+    dashboard_yaml = _find_dashboard_yaml(dashboard_yaml)
     if dashboard_yaml is None:
-        if (Path().cwd() / "dashboard.yaml").exists():
-            dashboard_yaml = Path().cwd() / "dashboard.yaml"
-        elif (Path().cwd() / "dashboard_component.yaml").exists():
-            dashboard_yaml = Path().cwd() / "dashboard_component.yaml"
-        else:
-            click.echo("No argument given and could find neither a "
-                    "default filename dashboard.yaml or dashboard_component.yaml."
-                    "Try `dashapp --help` for options. Aborting.")
-            return
-
-    if not str(dashboard_yaml).endswith(".yaml"):
-        click.echo("you need to pass a .yaml file to start a dashboard! Aborting.")
         return
 
     kwargs = {}
@@ -116,4 +149,134 @@ def dashapp(dashboard_yaml, no_browser, try_pickles, force_pickles, querystrings
 
     click.echo(f"dashapp ===> Starting dashboard:")
 
-    db.run(port)
\ No newline at end of file
+    db.run(port)
+
+# Cell
+
+def _config_port(dashboard_yaml, default=8050):
+    """returns the port stored in a DashApp yaml without loading the dashboard"""
+    config = _load_config(dashboard_yaml)
+    port = config.get("dash_app", {}).get("params", {}).get("port") if isinstance(config, dict) else None
+    return port if port is not None else default
+
+
+def _pick_server(server="auto"):
+    """returns the name of the first installed server of gunicorn (not on windows),
+    waitress and werkzeug, or checks that server is installed."""
+    candidates = ["gunicorn", "waitress"] if server == "auto" else [server]
+    for candidate in candidates:
+        if candidate == "gunicorn" and os.name == "nt":
+            continue
+        try:
+            __import__(candidate)
+            return candidate
+        except ImportError:
+            if server != "auto":
+                raise click.ClickException(f"{server} is not installed! Install with `pip install {server}`.")
+    return "werkzeug"
+
+
+def _app_factory(dashboard_yaml, server, try_pickles=False, force_pickles=False, mmap_mode=None,
+                 warmup=True, **dashapp_kwargs):
+    """returns a function without arguments that builds the flask app with create_app().
+    Names get generated deterministically, so that every worker that calls it (also
+    without --preload) serves the same element id's."""
+    return functools.partial(create_app, dashboard_yaml, try_pickles, force_pickles, mmap_mode,
+                             warmup=warmup, freeze_gc=(server == "gunicorn"),
+                             deterministic_names=True, **dashapp_kwargs)
+
+
+def _serve_gunicorn(app_factory, options):
+    """runs app_factory() in a gunicorn master with options as gunicorn settings"""
+    from gunicorn.app.base import BaseApplication
+
+    class DashappApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app_factory()
+
+    DashappApplication().run()
+
+
+@dashapp.command("serve")
+@click.argument("dashboard_yaml", nargs=1, required=False)
+@click.option("--server", "-s", "server", default="auto",
+                type=click.Choice(["auto", "gunicorn", "waitress", "werkzeug"]),
+                help="WSGI server to use. 'auto' picks gunicorn, then waitress, then "
+                     "the threaded werkzeug server, whichever is installed first.")
+@click.option("--host", "host", default="127.0.0.1",
+                help="host to bind to, e.g. 0.0.0.0 to accept outside connections")
+@click.option("--port", "-p", "port", default=None, type=click.INT,
+                help="port to bind to. Defaults to the port of the DashApp or 8050")
+@click.option("--workers", "-w", "workers", default=None, type=click.INT,
+                help="number of worker processes (gunicorn only). Defaults to 2 * cpus + 1")
+@click.option("--threads", "-t", "threads", default=4, type=click.INT,
+                help="number of threads per worker (gunicorn and waitress)")
+@click.option("--preload", "preload", is_flag=True,
+                help="load and warm up the dashboard once before forking the workers, so that "
+                     "the workers share the loaded data (gunicorn only). Element id's are the "
+                     "same in every worker either way.")
+@click.option("--timeout", "timeout", default=30, type=click.INT,
+                help="seconds after which a silent worker gets restarted (gunicorn), or an "
+                     "idle connection gets closed (waitress)")
+@click.option("--try-pickles", "-tp", "try_pickles", is_flag=True,
+                 help="if DashFigureFactory parameter config has filepath defined, try to load it from pickle.")
+@click.option("--force-pickles", "-fp", "force_pickles", is_flag=True,
+                 help="if DashFigureFactory parameter config has filepath defined, load it from pickle or raise exception.")
+@click.option("--mmap-mode", "mmap_mode", default=None, type=click.Choice(["r", "c"]),
+                 help="memory-map the data of DashFigureFactories that get loaded from file")
+@click.option("--no-warmup", "no_warmup", is_flag=True,
+                 help="do not render the default layout before serving the first request")
+@click.option("--querystrings", "-q", "querystrings", is_flag=True,
+                 help="Store state in url querystring")
+@click.option("--bootstrap", "-b", "bootstrap", is_flag=True,
+                 help="include default bootstrap css")
+def serve_dashboard(dashboard_yaml, server, host, port, workers, threads, preload, timeout,
+                    try_pickles, force_pickles, mmap_mode, no_warmup, querystrings, bootstrap):
+    """
+    Serve a dash app with a multi-process/multi-threaded WSGI server.
+
+    Uses the same yaml as `dashapp run`, e.g.:
+
+    \b
+        $ dashapp serve dashboard.yaml --workers 4 --preload
+
+    The dashboard gets built with dash_oop_components.wsgi.create_app. With gunicorn
+    and --preload it gets loaded and warmed up once in the master process, and
+    the forked workers share the loaded data. Without --preload every worker loads
+    the dashboard itself, with deterministic names so that all workers serve the
+    same element id's. Without gunicorn, the dashboard gets
+    served by waitress or by the threaded werkzeug server in a single process.
+    """
+    dashboard_yaml = _find_dashboard_yaml(dashboard_yaml)
+    if dashboard_yaml is None:
+        return
+
+    if port is None:
+        port = _config_port(dashboard_yaml)
+
+    server = _pick_server(server)
+    db_kwargs = {}
+    if querystrings: db_kwargs["querystrings"] = True
+    if bootstrap: db_kwargs["bootstrap"] = True
+    app_factory = _app_factory(dashboard_yaml, server, try_pickles, force_pickles, mmap_mode,
+                               warmup=not no_warmup, **db_kwargs)
+
+    if workers is None:
+        workers = 2 * (os.cpu_count() or 1) + 1 if server == "gunicorn" else 1
+    if workers > 1 and server != "gunicorn":
+        click.echo(f"dashapp ===> {server} runs a single process, ignoring --workers {workers}")
+
+    click.echo(f"dashapp ===> Serving dashboard with {server} at http://{host}:{port}/")
+    if server == "gunicorn":
+        _serve_gunicorn(app_factory, dict(bind=f"{host}:{port}", workers=workers, threads=threads,
+                                          preload_app=preload, timeout=timeout))
+    elif server == "waitress":
+        import waitress
+        waitress.serve(app_factory(), host=host, port=port, threads=threads, channel_timeout=timeout)
+    else:
+        from werkzeug.serving import run_simple
+        run_simple(host, port, app_factory(), threaded=True)
\ No newline at end of file
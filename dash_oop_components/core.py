@@ -1,32 +1,540 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: 00_core.ipynb (unless otherwise specified).
 
-__all__ = ['DashComponentBase', 'DashFigureFactory', 'DashComponent', 'DashComponentTabs', 'DashConnector',
-           'concat_docstring', 'parse_url_to_params', 'parse_url_to_qs_and_vals', 'encode_querystring_params_to_url',
-           'update_url_with_new_params', 'DashApp']
+__all__ = ['set_naming_mode', 'DashComponentBase', 'ConfigPlan', 'DashFigureFactory', 'CacheBackend',
+           'MemoryCacheBackend', 'DiskCacheBackend', 'SharedMemoryCacheBackend', 'set_figure_cache_backend',
+           'get_figure_cache_backend', 'FigureCache', 'figure_cache', 'CallbackProfiler', 'DashComponent',
+           'DashComponentTabs', 'DashConnector', 'concat_docstring', 'parse_url_to_params', 'parse_url_to_qs_and_vals',
+           'encode_querystring_params_to_url', 'update_url_with_new_params', 'LayoutTemplate', 'QuerystringRegistry',
+           'DashApp']
 
 # Cell
 
 import sys
-from abc import ABC
+from abc import ABC, abstractmethod
 import inspect
 import types
+import dis
 from importlib import import_module
+import os
+import json
+import time
+import zlib
+import struct
+import sqlite3
+import hashlib
+import threading
+import functools
+import itertools
+import weakref
+import contextvars
+import copy
+from collections import OrderedDict, namedtuple
 
 import shortuuid
 import oyaml as yaml
-from urllib.parse import urlparse, parse_qs, urlencode
-import ast
+from .querystring_codec import (encode_querystring, decode_querystring, UrlState,
+                                encode_querystring_delta, MERGE_QUERYSTRING_JS,
+                                clientside_querystring_js)
 
+import flask
 import dash
 from dash import html, dcc
-import jupyter_dash
+from plotly.utils import PlotlyJSONEncoder
 
-import dash_bootstrap_components as dbc
+# jupyter_dash and dash_bootstrap_components (and dill, joblib, numpy, pandas
+# and pyarrow) are only imported inside the code paths that need them, as they
+# add a lot of import time and memory to every process.
 
 # Cell
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 
+# Cell
+def _config_key(config):
+    """returns a hashable, normalized version of a (nested) config, so that
+    identical configs result in identical keys."""
+    if isinstance(config, dict):
+        return tuple(sorted((str(k), _config_key(v)) for k, v in config.items()))
+    if isinstance(config, (list, tuple)):
+        return tuple(_config_key(v) for v in config)
+    try:
+        hash(config)
+    except TypeError:
+        return (type(config).__name__, repr(config))
+    return (type(config).__name__, config)
+
+
+def _update_content_hash(hasher, value):
+    """feeds the content of a (nested) value into hasher. DataFrames, Series, Indexes and
+    arrays get hashed by their full content (their repr is truncated), DashFigureFactory
+    objects by their class and params. Raises TypeError for other objects, as their repr
+    does not identify their content (and usually contains their memory address)."""
+    if isinstance(value, dict):
+        hasher.update(b"{")
+        for k, v in sorted((str(k), v) for k, v in value.items()):
+            hasher.update(repr(k).encode("utf8") + b":")
+            _update_content_hash(hasher, v)
+        hasher.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"[")
+        for v in value:
+            _update_content_hash(hasher, v)
+            hasher.update(b",")
+        hasher.update(b"]")
+    elif value is None or isinstance(value, (str, bytes, int, float, complex)):
+        hasher.update(f"{type(value).__name__}:{value!r};".encode("utf8"))
+    elif isinstance(value, DashFigureFactory):
+        hasher.update(f"{type(value).__module__}.{type(value).__qualname__}".encode("utf8"))
+        _update_content_hash(hasher, dict(value._record.items()))
+    else:
+        # numpy and pandas only get checked when they have been imported already:
+        np, pd = sys.modules.get("numpy"), sys.modules.get("pandas")
+        if pd is not None and isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+            hasher.update(f"{type(value).__name__}:{getattr(value, 'shape', '')}:".encode("utf8"))
+            if isinstance(value, pd.DataFrame):
+                _update_content_hash(hasher, [str(c) for c in value.columns])
+                _update_content_hash(hasher, [str(d) for d in value.dtypes])
+            else:
+                hasher.update(f"{value.name!r}:{value.dtype}:".encode("utf8"))
+            hasher.update(pd.util.hash_pandas_object(
+                value, index=not isinstance(value, pd.Index)).values.tobytes())
+        elif np is not None and isinstance(value, np.ndarray):
+            hasher.update(f"ndarray:{value.dtype}:{value.shape}:".encode("utf8"))
+            if value.dtype.hasobject:
+                _update_content_hash(hasher, value.tolist())
+            else:
+                hasher.update(np.ascontiguousarray(value).tobytes())
+        elif np is not None and isinstance(value, np.generic):
+            _update_content_hash(hasher, value.item())
+        else:
+            raise TypeError(f"Cannot hash the content of a {type(value).__name__}!")
+
+
+def _content_hash(value):
+    """returns a sha1 hexdigest of the content of a (nested) value that is the same in every
+    process. Raises TypeError when value holds an object whose content cannot be hashed."""
+    hasher = hashlib.sha1()
+    _update_content_hash(hasher, value)
+    return hasher.hexdigest()
+
+# Cell
+def _stable_repr(value):
+    """returns a repr of a (nested) config that is the same in every process,
+    i.e. that does not depend on object ids or hash randomization."""
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k!r}: {_stable_repr(v)}" for k, v in sorted(
+            (str(k), v) for k, v in value.items())) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_stable_repr(v) for v in value) + "]"
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return repr(value)
+    if isinstance(value, DashComponent):
+        return f"{value.__class__.__name__}(name={value.name!r})"
+    return value.__class__.__name__
+
+
+_naming_mode = "uuid"
+_root_name_counts = {}
+
+def set_naming_mode(mode="uuid"):
+    """Sets how DashComponents that do not get passed a name generate their name:
+
+    - 'uuid' (default): a random uuid, so different in every process.
+    - 'deterministic': a stable hash of the position of the component in the tree
+        of components under construction, its class and its params. Every process
+        (e.g. every gunicorn worker) that builds the same dashboard then generates
+        the same element id's.
+
+    Args:
+        mode (str): either 'uuid' or 'deterministic'
+    """
+    global _naming_mode
+    if mode not in {"uuid", "deterministic"}:
+        raise ValueError(f"mode should be either 'uuid' or 'deterministic', but got {mode}!")
+    _naming_mode = mode
+    _root_name_counts.clear()
+
+# Cell
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+_JSON_SUFFIXES = (".json",)
+_MSGPACK_SUFFIXES = (".msgpack", ".mpk")
+_CONFIG_SUFFIXES = (".yaml", ".yml") + _JSON_SUFFIXES + _MSGPACK_SUFFIXES
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("Storing configs as .msgpack requires msgpack: pip install msgpack") from None
+    return msgpack
+
+
+def _yaml_dump(config):
+    """returns config as a yaml str (keeping the order of the dicts), using the
+    libyaml C dumper when available. Configs that the safe dumper cannot
+    represent (e.g. tuples) get dumped with the default yaml.Dumper."""
+    try:
+        return yaml.dump(config, Dumper=_YamlDumper)
+    except yaml.representer.RepresenterError:
+        return yaml.dump(config)
+
+
+def _parse_config(content, filepath):
+    """parses the contents (bytes) of config file filepath: json for '.json',
+    msgpack for '.msgpack' and '.mpk' and yaml (with the libyaml C loader when available)
+    for anything else"""
+    filepath = str(filepath)
+    if filepath.endswith(_JSON_SUFFIXES):
+        return json.loads(content)
+    if filepath.endswith(_MSGPACK_SUFFIXES):
+        return _import_msgpack().unpackb(content, raw=False, strict_map_key=False)
+    return yaml.load(content, Loader=_YamlLoader)
+
+
+def _load_config(filepath):
+    """returns the config stored in filepath, see _parse_config()"""
+    with open(str(filepath), "rb") as f:
+        return _parse_config(f.read(), filepath)
+
+
+def _dump_config(config, filepath):
+    """stores config to filepath as json, msgpack or yaml depending on the suffix"""
+    filepath = str(filepath)
+    if filepath.endswith(_JSON_SUFFIXES):
+        with open(filepath, "w") as f:
+            json.dump(config, f)
+    elif filepath.endswith(_MSGPACK_SUFFIXES):
+        content = _import_msgpack().packb(config, use_bin_type=True)
+        with open(filepath, "wb") as f:
+            f.write(content)
+    else:
+        content = _yaml_dump(config)
+        with open(filepath, "w") as f:
+            f.write(content)
+
+# Cell
+_BINARY_SUFFIXES = (".npy", ".arrow", ".parquet")
+
+def _dump_binary(obj, filepath):
+    """stores obj to the directory filepath: DataFrame, Series and numpy array attributes
+    of obj get stored as side files, and the rest of the object (the skeleton) gets pickled
+    to skeleton.pkl.
+
+    Depending on the suffix of filepath, DataFrames and Series get stored as one
+    .npy file per column ('.npy'), as Arrow IPC files ('.arrow', requires pyarrow) or
+    as Parquet files ('.parquet'). Numpy arrays always get stored as .npy files.
+    With '.npy', columns and indexes that do not have a plain numpy dtype (e.g. strings)
+    get pickled into the skeleton.
+
+    Every reference to a side filed object (e.g. also from the stored params) gets
+    pickled as a reference to its side file, so that the data never ends up in the skeleton.
+    """
+    import pickle
+    import numpy as np
+    from pathlib import Path
+    path, fmt = Path(filepath), Path(filepath).suffix
+    path.mkdir(parents=True, exist_ok=True)
+
+    def is_plain(dtype):
+        return isinstance(dtype, np.dtype) and not dtype.hasobject
+
+    side_filed, manifest = {}, {}
+    for attr, value in obj.__dict__.items():
+        kind = type(value).__name__
+        if id(value) in side_filed:
+            continue
+        if isinstance(value, np.ndarray) and is_plain(value.dtype):
+            np.save(path / f"{attr}.npy", value, allow_pickle=False)
+            manifest[attr] = ("ndarray", None, f"{attr}.npy")
+        elif type(value).__module__.startswith("pandas") and kind in {"DataFrame", "Series"}:
+            names = value.name if kind == "Series" else value.columns
+            frame = value.to_frame() if kind == "Series" else value
+            frame = frame.set_axis([str(i) for i in range(frame.shape[1])], axis=1)
+            if fmt == ".npy":
+                files, pickled = {}, {}
+                for col, series in frame.items():
+                    if is_plain(series.dtype):
+                        files[col] = f"{attr}.{col}.npy"
+                        np.save(path / files[col], series.to_numpy(), allow_pickle=False)
+                    else:
+                        pickled[col] = series.to_numpy()
+                index = frame.index
+                if index.nlevels == 1 and is_plain(index.dtype) and type(index).__name__ != "RangeIndex":
+                    np.save(path / f"{attr}.index.npy", index.to_numpy(), allow_pickle=False)
+                    index = (index.name, f"{attr}.index.npy")
+                manifest[attr] = (kind, names, dict(files=files, pickled=pickled, index=index))
+            elif fmt == ".arrow":
+                import pyarrow as pa
+                table = pa.Table.from_pandas(frame)
+                with pa.OSFile(str(path / f"{attr}.arrow"), "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                manifest[attr] = (kind, names, f"{attr}.arrow")
+            else:
+                frame.to_parquet(path / f"{attr}.parquet")
+                manifest[attr] = (kind, names, f"{attr}.parquet")
+        else:
+            continue
+        side_filed[id(value)] = attr
+
+    with open(path / "skeleton.pkl", "wb") as f:
+        pickle.dump(manifest, f)
+        pickler = pickle.Pickler(f)
+        pickler.persistent_id = lambda value: side_filed.get(id(value))
+        pickler.dump(obj)
+
+
+def _load_side_file(path, kind, names, stored, mmap_mode=None):
+    """returns the array, DataFrame or Series stored by _dump_binary() as described
+    by its manifest entry (kind, names, stored)"""
+    import numpy as np
+    if kind == "ndarray":
+        return np.load(path / stored, mmap_mode=mmap_mode, allow_pickle=False)
+    import pandas as pd
+    if isinstance(stored, dict):
+        index = stored["index"]
+        if isinstance(index, tuple):
+            index = pd.Index(np.load(path / index[1], mmap_mode=mmap_mode, allow_pickle=False),
+                             name=index[0], copy=False)
+        columns = sorted(list(stored["files"]) + list(stored["pickled"]), key=int)
+        data = {col: np.load(path / stored["files"][col], mmap_mode=mmap_mode, allow_pickle=False)
+                    if col in stored["files"] else stored["pickled"][col] for col in columns}
+        frame = pd.DataFrame(data, index=index, copy=False)
+    elif stored.endswith(".arrow"):
+        import pyarrow as pa
+        with pa.memory_map(str(path / stored), "r") as source:
+            frame = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=mmap_mode is not None)
+    else:
+        frame = pd.read_parquet(path / stored)
+    if kind == "Series":
+        return frame.iloc[:, 0].rename(names)
+    frame.columns = names
+    return frame
+
+
+def _load_binary(filepath, mmap_mode=None):
+    """loads an object that was stored with _dump_binary().
+
+    With mmap_mode ('r' or 'c') .npy files get memory-mapped instead of read, so
+    that the arrays and DataFrame columns are backed by the (shared) page cache.
+    Arrow IPC files always get memory-mapped, and with mmap_mode numeric
+    columns get converted to pandas without copying.
+
+    Every reference to a side filed object gets bound to the same loaded object.
+    """
+    import pickle
+    from pathlib import Path
+    path, loaded = Path(filepath), {}
+
+    with open(path / "skeleton.pkl", "rb") as f:
+        manifest = pickle.load(f)
+        def persistent_load(attr):
+            if attr not in loaded:
+                loaded[attr] = _load_side_file(path, *manifest[attr], mmap_mode)
+            return loaded[attr]
+        unpickler = pickle.Unpickler(f)
+        unpickler.persistent_load = persistent_load
+        return unpickler.load()
+
+# Cell
+def _local_accesses(code, nested=False):
+    """yields (opname, name) of the instructions in code that access local variables
+    (for nested code objects only the cell variables, which may belong to code)"""
+    for instr in dis.get_instructions(code):
+        if (("FAST" in instr.opname and not nested) or "DEREF" in instr.opname
+                or instr.opname == "LOAD_CLOSURE"):
+            for name in (instr.argval if isinstance(instr.argval, tuple) else (instr.argval,)):
+                yield instr.opname, name
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _local_accesses(const, nested=True)
+
+
+_RESERVED_PARAM_NAMES = frozenset({'dash_component', 'dash_figure_factory', 'dash_app'})
+
+
+class _ParamCapture:
+    """Binds the arguments of a constructor call to the parameter names of __init__,
+    in the same way as _store_child_params() reads them from the frame of the
+    __init__: all positional-or-keyword params (without self), plus **kwargs when
+    it is called 'kwargs'. Extra positional arguments that go to *args do not get
+    bound (the frame of __init__ does not list them as params either).
+
+    Gets built once per class from the inspect.Signature of its __init__ with
+    _ParamCapture.for_init(), which returns None when the params cannot be bound
+    from the call alone: when they get reassigned in the body of __init__ (so that
+    the frame holds a different value by the time super().__init__() gets called),
+    or when 'kwargs' gets used in the body (and so may get mutated).
+    """
+    __slots__ = ("names", "name_set", "keyword_set", "defaults", "all_defaults", "kwargs", "param_names")
+
+    def __init__(self, signature):
+        params = list(signature.parameters.values())[1:]
+        self.names = tuple(p.name for p in params if p.kind == p.POSITIONAL_OR_KEYWORD)
+        self.name_set = frozenset(self.names)
+        self.keyword_set = frozenset(p.name for p in params if p.kind != p.VAR_KEYWORD)
+        self.defaults = {p.name: p.default for p in params
+                            if p.kind == p.POSITIONAL_OR_KEYWORD and p.default is not p.empty}
+        self.all_defaults = len(self.defaults) == len(self.names)
+        self.kwargs = any(p.kind == p.VAR_KEYWORD and p.name == "kwargs" for p in params)
+        self.param_names = self.names + ("kwargs",) if self.kwargs else self.names
+
+    @classmethod
+    def for_init(cls, init):
+        if not inspect.isfunction(init) or hasattr(init, "__wrapped__"):
+            return None
+        signature = inspect.signature(init)
+        params = list(signature.parameters.values())
+        if not params or any(p.kind == p.POSITIONAL_ONLY for p in params):
+            return None
+        capture = cls(signature)
+        code = init.__code__
+        if "kwargs" in code.co_varnames + code.co_cellvars and not capture.kwargs:
+            return None
+        for opname, name in _local_accesses(code):
+            if name == "kwargs" and capture.kwargs:
+                return None
+            if name in capture.names and not opname.startswith("LOAD"):
+                return None
+        return capture
+
+    def bind(self, args, kwargs):
+        """returns (param names, values) for a call with args and kwargs. The
+        tuple of param names is the same for every call."""
+        if not args and self.all_defaults and kwargs.keys() <= self.name_set:
+            values = tuple({**self.defaults, **kwargs}.values())
+            return self.param_names, values + ({},) if self.kwargs else values
+        # arguments beyond the named params go to *args, which does not get stored:
+        values = list(args[:len(self.names)])
+        defaults = self.defaults
+        for name in self.names[len(values):]:
+            values.append(kwargs[name] if name in kwargs else defaults[name])
+        if self.kwargs:
+            values.append({k: v for k, v in kwargs.items() if k not in self.keyword_set})
+        return self.param_names, tuple(values)
+
+
+def _intern(value):
+    """returns the interned version of value if it is a str, so that ids and names
+    that get stored by many components only exist once in memory"""
+    return sys.intern(value) if type(value) is str else value
+
+
+# tuples of param names read from frames, so that instances of the same class share them
+_frame_param_names = {}
+
+
+class _ParamsRecord:
+    """Compact bookkeeping of a DashComponentBase, stored as ._record.
+
+    The stored params are kept as a tuple of names (shared by all instances of a
+    class) and a tuple of values, which are the same objects as the attributes.
+    The ._stored_params dict only gets built when it is needed (e.g. by .to_config()),
+    at which point values of the types in ._config_param_types get replaced by
+    their config. From then on the dict holds the params.
+    """
+    __slots__ = ("names", "values", "params")
+
+    def __init__(self, names=(), values=()):
+        self.names, self.values, self.params = names, values, None
+
+    def items(self, convert=()):
+        """returns list of (name, value) of all params, with values of the types
+        in convert replaced by their .to_config()"""
+        items = self.params.items() if self.params is not None else zip(self.names, self.values)
+        return [(name, value.to_config() if isinstance(value, convert) else value)
+                    for name, value in items]
+
+    def as_dict(self, convert=()):
+        """returns the params dict, building it on first use"""
+        if self.params is None:
+            self.params = dict(self.items(convert))
+            self.names, self.values = (), ()
+        return self.params
+
+    def set(self, name, value):
+        if self.params is not None:
+            self.params[name] = value
+        elif name in self.names:
+            pos = self.names.index(name)
+            self.values = self.values[:pos] + (value,) + self.values[pos+1:]
+        else:
+            self.names, self.values = self.names + (name,), self.values + (value,)
+
+    def update(self, names, values):
+        if self.params is None and not self.names:
+            self.names, self.values = names, values
+        else:
+            for name, value in zip(names, values):
+                self.set(name, value)
+
+
+class _ComponentRecord(_ParamsRecord):
+    """_ParamsRecord of a DashComponent, which adds the querystring params
+    (tuple of (id, attr) or None when not discovered yet), the registered
+    subcomponents (tuple) and whether they are up to date with the attributes
+    (scanned), the querystring params per tab of its DashComponentTabs
+    (dict or None) and the _TreeIndex of the tree under the component (or None)"""
+    __slots__ = ("querystring_params", "components", "scanned", "tab_params", "tree")
+
+    def __init__(self, names=(), values=()):
+        self.names, self.values, self.params = names, values, None
+        self.querystring_params, self.components, self.scanned = None, (), False
+        self.tab_params, self.tree = None, None
+
+    def __getstate__(self):
+        # the tree index only holds for the objects of this process
+        return None, dict({slot: getattr(self, slot) for slot in _ParamsRecord.__slots__ + self.__slots__},
+                          tree=None)
+
+
+# gets a new value whenever a DashComponent gets assigned to an attribute of a DashComponent,
+# which invalidates all _TreeIndex instances. New values get drawn from an itertools.count,
+# which is atomic, so concurrent invalidations never hand out the same generation twice.
+_tree_generations = itertools.count(1)
+_tree_generation = 0
+# DashComponent and all its subclasses, for a check that is cheaper than isinstance() on an ABC
+_dash_component_classes = set()
+
+
+class _TreeIndex:
+    """Flattened index of the tree of DashComponents under root, built by
+    DashComponent._tree_index().
+
+    Attributes:
+        components (tuple): root and all (nested) subcomponents, parents first
+        parents (tuple): for every component the position of its parent
+            in components (-1 for root)
+        positions (dict): id() of every component to its position in components
+        generation (int): value of _tree_generation the index is valid for
+    """
+    __slots__ = ("components", "parents", "positions", "generation")
+
+    def __init__(self, root):
+        # read before walking, so that a DashComponent that gets assigned while walking
+        # (e.g. in another thread) makes this index out of date instead of getting lost:
+        self.generation = _tree_generation
+        components, parents, positions = [], [], {}
+        stack = [(root, -1)]
+        while stack:
+            comp, parent = stack.pop()
+            if id(comp) in positions:
+                continue
+            positions[id(comp)] = len(components)
+            stack.extend((child, len(components)) for child in reversed(comp._registered_components()))
+            components.append(comp)
+            parents.append(parent)
+        self.components, self.parents, self.positions = tuple(components), tuple(parents), positions
+
+    def parent(self, comp):
+        """returns the parent of comp in the tree, or None for root"""
+        pos = self.parents[self.positions[id(comp)]]
+        return self.components[pos] if pos >= 0 else None
+
 # Cell
 class DashComponentBase(ABC):
     """Base class for all dash_oop_components classes.
@@ -34,6 +542,29 @@ class DashComponentBase(ABC):
     Stores parameter of child classes to attributes and ._stored_params.
     Proved .to_config(), to_yaml(), .from_config() and .from_yaml() methods
     """
+    _param_capture, _param_capture_depth = None, None
+    # class of ._record, and types of params that get stored to config as their .to_config()
+    _record_class, _config_param_types = _ParamsRecord, ()
+
+    def __new__(cls, *args, **kwargs):
+        self = object.__new__(cls)
+        if args or kwargs:
+            # the constructor args, for the first call of _store_child_params()
+            self.__dict__['_constructor_args'] = (args, kwargs)
+        return self
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # every __init__ in the mro calls super().__init__(), so the frame of cls.__init__
+        # is _param_capture_depth frames up from _store_child_params() (through
+        # DashComponentBase.__init__). When child_depth points there, the params
+        # can be bound from the constructor args instead of read from that frame.
+        inits = [base for base in cls.__mro__[:cls.__mro__.index(DashComponentBase)]
+                    if "__init__" in base.__dict__]
+        cls._param_capture = _ParamCapture.for_init(cls.__init__)
+        cls._param_capture_depth = (len(inits) + 1 if all(issubclass(base, DashComponentBase)
+                                                          for base in inits) else None)
+
     def __init__(self, no_store=None, no_attr=None, no_config=None, child_depth=3):
         """
         Args:
@@ -48,6 +579,28 @@ class DashComponentBase(ABC):
         """
         self._store_child_params(no_store, no_attr, no_config, child_depth)
 
+    @property
+    def _stored_params(self):
+        """dict of the params that get stored to config, built from ._record on first use"""
+        return self._record.as_dict(self._config_param_types)
+
+    @_stored_params.setter
+    def _stored_params(self, params):
+        record = self.__dict__.get('_record')
+        if record is None:
+            record = self.__dict__['_record'] = self._record_class()
+        record.names, record.values, record.params = (), (), params
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_record' not in state and '_stored_params' in state:
+            # pickled before the bookkeeping got moved into ._record
+            params = self.__dict__.pop('_stored_params')
+            for attr in ('_querystring_params', '_components', '_tab_params'):
+                if attr in self.__dict__:
+                    setattr(self, attr, self.__dict__.pop(attr))
+            self._stored_params = params
+
     def _store_child_params(self, no_store=None, no_attr=None, no_config=None, child_depth=3):
         """
         Args:
@@ -61,15 +614,36 @@ class DashComponentBase(ABC):
                 Defaults to 3 (i.e. The child of the child of DashComponentBase)
         """
 
-        if not hasattr(self, '_stored_params'):
-            self._stored_params = {}
-
-        child_frame = sys._getframe(child_depth)
-        child_args = child_frame.f_code.co_varnames[1:child_frame.f_code.co_argcount]
-        child_dict = {arg: child_frame.f_locals[arg] for arg in child_args}
-        if 'kwargs' in child_frame.f_locals:
-            child_dict['kwargs'] = child_frame.f_locals['kwargs']
+        names = None
+        record = self.__dict__.get('_record')
+        if record is None:
+            # first call during construction: the constructor args are the params
+            # of the __init__ of the class, so no need to look them up in its frame
+            args, kwargs = self.__dict__.pop('_constructor_args', ((), {}))
+            if child_depth == self._param_capture_depth and self._param_capture is not None:
+                names, values = self._param_capture.bind(args, kwargs)
+
+        if names is None:
+            child_frame = sys._getframe(child_depth)
+            child_locals = child_frame.f_locals
+            names = child_frame.f_code.co_varnames[1:child_frame.f_code.co_argcount]
+            if 'kwargs' in child_locals and 'kwargs' not in names:
+                names += ('kwargs',)
+            names = _frame_param_names.setdefault(names, names)
+            values = tuple([child_locals[name] for name in names])
+
+        if (no_store is None and no_attr is None and no_config is None
+                and _RESERVED_PARAM_NAMES.isdisjoint(names)):
+            for name, value in zip(names, values):
+                setattr(self, name, value)
+            if record is None:
+                self.__dict__['_record'] = self._record_class(names, values)
+            else:
+                record.update(names, values)
+            return
 
+        if record is None:
+            record = self.__dict__['_record'] = self._record_class()
         if isinstance(no_store, bool) and no_store:
             return
         else:
@@ -80,19 +654,22 @@ class DashComponentBase(ABC):
             if no_attr is None: no_attr = tuple()
             dont_attr = False
 
-        if isinstance(no_config, bool) and no_param: dont_config = True
+        if isinstance(no_config, bool) and no_config: dont_config = True
         else:
             if no_config is None: no_config= tuple()
             dont_config = False
 
-        for name, value in child_dict.items():
-            if name in {'dash_component', 'dash_figure_factory', 'dash_app'}:
+        stored_names, stored_values = [], []
+        for name, value in zip(names, values):
+            if name in _RESERVED_PARAM_NAMES:
                 raise ValueError(f"Please do not use {name} as a parameter name, "
                                  "as this results in a confusing and hard to parse config.")
             if not dont_attr and name not in no_store and name not in no_attr:
                 setattr(self, name, value)
             if not dont_config and name not in no_store and name not in no_config:
-                self._stored_params[name] = value
+                stored_names.append(name)
+                stored_values.append(value)
+        record.update(tuple(stored_names), tuple(stored_values))
 
     def to_config(self):
         """
@@ -107,38 +684,54 @@ class DashComponentBase(ABC):
         """
         stores a yaml configuration to disk.
 
+        If the filepath ends with '.json' or '.msgpack' the configuration
+        gets stored in that format instead, which loads a lot faster for big
+        generated configs.
+
         If no filepath is given, returns a str of the yaml config.
         """
         yaml_config = self.to_config()
         if filepath is not None:
-            yaml.dump(yaml_config, open(filepath, "w"))
+            _dump_config(yaml_config, filepath)
             return
-        return yaml.dump(yaml_config)
+        return _yaml_dump(yaml_config)
 
     def dump(self, filepath=None):
         """store the object to disk.
 
         Default serializer is pickle, however depending on file suffix,
-        dill or joblib will be used."""
+        dill or joblib will be used.
+
+        With suffix '.npy', '.arrow' or '.parquet', filepath becomes a directory in
+        which DataFrame, Series and numpy array attributes get stored as separate
+        binary files (.npy, Arrow IPC or Parquet), and the rest of the object
+        gets pickled separately. These load much faster and without
+        a second copy of the data in memory while deserializing."""
         if filepath is None and hasattr(self, "filepath"):
             filepath = self.filepath
         filepath = str(filepath)
         if filepath.endswith(".pkl") or filepath.endswith(".pickle"):
             import pickle
-            pickle.dump(self, open(filepath, "wb"))
+            with open(filepath, "wb") as f:
+                pickle.dump(self, f)
         elif filepath.endswith(".dill"):
             import dill
-            dill.dump(self, open(filepath, "wb"))
+            with open(filepath, "wb") as f:
+                dill.dump(self, f)
         elif str(filepath).endswith(".joblib"):
             import joblib
             joblib.dump(self, filepath)
+        elif filepath.endswith(_BINARY_SUFFIXES):
+            _dump_binary(self, filepath)
         else:
             filepath = filepath + ".pkl"
             import pickle
-            pickle.dump(self, open(filepath, "wb"))
+            with open(filepath, "wb") as f:
+                pickle.dump(self, f)
 
     @classmethod
-    def from_config(cls, config, try_pickles=False, force_pickles=False, **update_params):
+    def from_config(cls, config, try_pickles=False, force_pickles=False,
+                    share_factories=True, mmap_mode=None, **update_params):
         """
         Loads a dash_oop_component class from a configuration dict.
 
@@ -148,105 +741,25 @@ class DashComponentBase(ABC):
                 if it fails, load from config
             force_pickles (bool): when finding a filepath parameter try loading from that file,
                 if it fails, raise error
+            share_factories (bool): if True, identical DashFigureFactory configs
+                inside config only get loaded once, and the resulting instance gets
+                shared between all components. Defaults to True.
+            mmap_mode (str): when loading from file, memory-map the stored arrays
+                and DataFrames with this mode ('r' or 'c'), see .from_file()
             **update_params: kwargs that override settings in params
 
         Returns:
             Instance of the class defined in the config.
         """
-        if 'dash_component' in config:
-            config = config['dash_component']
-        elif 'dash_figure_factory' in config:
-            config = config['dash_figure_factory']
-        elif 'dash_app' in config:
-            config = config['dash_app']
-        else:
-            raise ValueError("I only know how to build dash_component, "
-                             "dash_figure_factory and dash_app from config!", str(config))
-
-
-
-        params = config['params']
-        if not params: params = {}
-
-        if (try_pickles or force_pickles) and 'filepath' in params and params['filepath'] is not None:
-            try:
-                filepath = params['filepath']
-                return cls.from_file(filepath)
-            except FileNotFoundError as e:
-                if force_pickles:
-                    raise FileNotFoundError(
-                        f"Couldn't find {filepath}! Either change the filepath"
-                        " in the configuration or the yaml file, pass "
-                        "force_filepath=False or try_filepath=True, or pass the "
-                        "correct filepath as **kwargs...")
-                else:
-                    print(f"Couldn't find {filepath}! You could try passing correct filepath as kwarg."
-                          "Now loading from config instead...", flush=True)
-
-        for k, v in update_params.items():
-            if k in params:
-                params[k] = v
-            elif 'kwargs' in params:
-                params['kwargs'][k]=v
-            else:
-                raise ValueError(f"This dash_oop_component does not take {k} as an argument, "
-                                "nor does it take **kwargs!")
-
-        for k, v in params.items():
-            if isinstance(v, dict) and len(v)==1 and ('dash_figure_factory' in v or 'dash_component' in v):
-                if try_pickles or force_pickles:
-                    if ('dash_component' in v
-                        and 'filepath' in v['dash_component']['params']):
-                        filepath = v['dash_component']['params']['filepath']
-                    elif ('dash_figure_factory' in v
-                          and 'filepath' in v['dash_figure_factory']['params']):
-                        filepath = v['dash_figure_factory']['params']['filepath']
-                    else:
-                        filepath = None
-                    if filepath is not None:
-                        try:
-                            params[k] = DashComponentBase.from_file(filepath)
-                        except FileNotFoundError as e:
-                            if force_pickles:
-                                raise FileNotFoundError(
-                                    f"Couldn't find {filepath}! Either change the filepath"
-                                    " in the configuration or the yaml file, pass "
-                                    "force_filepath=False or pass try_filepath=True")
-                            else:
-                                print(f"Couldn't find {filepath}! So loading from config instead...", flush=True)
-                                params[k] = DashComponentBase.from_config(v)
-                    else:
-                        params[k] = DashComponentBase.from_config(v)
-                else:
-                    params[k] = DashComponentBase.from_config(v)
-
-        try:
-            component_class = getattr(import_module(config['module']), config['class_name'])
-        except ModuleNotFoundError:
-            import sys
-            from pathlib import Path
-            sys.path.append(str(Path.cwd()))
-            component_class = getattr(import_module(config['module']), config['class_name'])
-
-        if 'kwargs' in params:
-            kwargs = params.pop('kwargs')
-        else:
-            kwargs = {}
-
-        if "name" in params:
-            name = params.pop('name')
-        else:
-            name = None
-
-        comp = component_class(**params, **kwargs)
-        if name is not None:
-            comp.name = name
-        return comp
+        return ConfigPlan(config).instantiate(try_pickles, force_pickles, share_factories,
+                                              mmap_mode, **update_params)
 
     @classmethod
-    def from_yaml(cls, yaml_filepath, try_pickles=False, force_pickles=False,  **update_params):
+    def from_yaml(cls, yaml_filepath, try_pickles=False, force_pickles=False,
+                  share_factories=True, mmap_mode=None, cache_plan=False, **update_params):
         """
-        Loads a dash_oop_component class from a yaml file.
+        Loads a dash_oop_component class from a yaml file (or a .json or .msgpack
+        config file, depending on the suffix).
 
         Args:
             yaml_filepath (str, Path): filepath of a .yaml file, generated from .to_yaml()
@@ -254,23 +767,42 @@ class DashComponentBase(ABC):
                 if it fails, load from config
             force_pickles (bool): when finding a filepath parameter try loading from that file,
                 if it fails, raise errors
+            share_factories (bool): if True, identical DashFigureFactory configs only
+                get loaded once and the instance gets shared. Defaults to True.
+            mmap_mode (str): when loading from file, memory-map the stored arrays
+                and DataFrames with this mode ('r' or 'c'), see .from_file()
+            cache_plan (bool): store the compiled ConfigPlan in a file beside the yaml
+                and reuse it as long as the yaml does not change, see ConfigPlan.from_yaml().
+                Defaults to False.
             update_params: a dict of parameters to be overridden by update_params
 
         Returns:
             Instance of the class defined in the yaml file.
         """
-        config = yaml.safe_load(open(str(yaml_filepath), "r"))
-        return cls.from_config(config, try_pickles, force_pickles, **update_params)
+        if cache_plan:
+            return ConfigPlan.from_yaml(yaml_filepath).instantiate(
+                try_pickles, force_pickles, share_factories, mmap_mode, **update_params)
+        config = _load_config(yaml_filepath)
+        return cls.from_config(config, try_pickles, force_pickles, share_factories,
+                               mmap_mode, **update_params)
 
     @classmethod
-    def from_file(cls, filepath):
+    def from_file(cls, filepath, mmap_mode=None):
         """Load a DashComponentBase from file. Depending on the suffix of the filepath
-        will either load with pickle ('.pkl'), dill ('.dill') or joblib ('joblib').
+        will either load with pickle ('.pkl'), dill ('.dill') or joblib ('joblib'),
+        or load a binary directory ('.npy', '.arrow' or '.parquet', see .dump()).
 
         If no suffix given, will try with pickle (and try adding ''.pkl')
 
+        With mmap_mode='r' (read-only) or mmap_mode='c' (copy-on-write), large arrays
+        and DataFrame columns do not get read into memory, but get memory-mapped from
+        the stored files (for '.npy' and '.arrow' directories and '.joblib' files).
+        All processes (e.g. gunicorn workers) that map the same file then share a single
+        copy of the data in the page cache. Pickle and dill files cannot be memory-mapped.
+
         Args:
             filepath {str, Path} the location of the stored component
+            mmap_mode {str}: None, 'r' or 'c'. Defaults to None.
 
         returns:
             DashComponentBase
@@ -278,13 +810,17 @@ class DashComponentBase(ABC):
         filepath = str(filepath)
         if filepath.endswith(".pkl") or str(filepath).endswith(".pickle"):
             import pickle
-            return pickle.load(open(filepath, "rb"))
+            with open(filepath, "rb") as f:
+                return pickle.load(f)
         elif filepath.endswith(".dill"):
             import dill
-            return dill.load(open(filepath, "rb"))
+            with open(filepath, "rb") as f:
+                return dill.load(f)
         elif filepath.endswith(".joblib"):
             import joblib
-            return joblib.load(filepath)
+            return joblib.load(filepath, mmap_mode=mmap_mode)
+        elif filepath.endswith(_BINARY_SUFFIXES):
+            return _load_binary(filepath, mmap_mode)
         else:
             from pathlib import Path
             filepath = Path(filepath)
@@ -294,11 +830,285 @@ class DashComponentBase(ABC):
                 else:
                     raise ValueError(f"Cannot find file: {str(filepath)}")
             import pickle
-            return pickle.load(open(str(filepath), "rb"))
+            with open(str(filepath), "rb") as f:
+                return pickle.load(f)
+
+
+# Cell
+_PLAN_CACHE_FORMAT = 1
+_IMMUTABLE_PARAM_TYPES = (str, int, float, bool, bytes, type(None))
+
+_PlanRef = namedtuple("_PlanRef", ["index"])
+_PlanNode = namedtuple("_PlanNode", ["module", "class_name", "cls", "params", "filepath", "shared", "level"])
+
+
+def _nested_config(value):
+    """returns True if value is the config of a DashFigureFactory or DashComponent"""
+    return (isinstance(value, dict) and len(value) == 1
+            and ('dash_figure_factory' in value or 'dash_component' in value))
 
 
+def _resolve_class(module_name, class_name, classes):
+    """returns class class_name from module module_name, memoized in dict classes.
+    If the module cannot be found, the current working directory gets added to
+    sys.path (once) and the import retried."""
+    key = (module_name, class_name)
+    if key not in classes:
+        try:
+            module = import_module(module_name)
+        except ModuleNotFoundError:
+            from pathlib import Path
+            cwd = str(Path.cwd())
+            if cwd in sys.path:
+                raise
+            sys.path.append(cwd)
+            module = import_module(module_name)
+        classes[key] = getattr(module, class_name)
+    return classes[key]
+
+
+def _copy_param(value):
+    """returns a copy of param value, so that instances never share mutable params"""
+    if isinstance(value, _IMMUTABLE_PARAM_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+class ConfigPlan:
+    """Immutable build plan for a configuration dict, generated by .to_config().
+
+    Compiling resolves the classes of all nested components and factories once,
+    puts the nodes in dependency order (every node after the nodes in its params)
+    and marks identical DashFigureFactory configs as shared. The plan can then be
+    instantiated any number of times, without reading or mutating the original config:
+
+        plan = ConfigPlan(db.to_config())
+        db1, db2 = plan.instantiate(), plan.instantiate(querystrings=False)
+
+    ConfigPlan.from_yaml() stores the compiled plan beside the yaml file and reuses
+    it as long as the yaml does not change.
+    """
+    def __init__(self, config):
+        """
+        Args:
+            config (dict): configuration dict, generated from .to_config()
+        """
+        nodes, classes, shared = [], {}, {}
+        self._root = self._compile(config, nodes, classes, shared, level=0)
+        self._nodes = tuple(nodes)
+
+    @staticmethod
+    def _compile(config, nodes, classes, shared, level):
+        """appends the nodes of config (dependencies first) to nodes and returns the index of its root node"""
+        if 'dash_component' in config:
+            inner = config['dash_component']
+        elif 'dash_figure_factory' in config:
+            inner = config['dash_figure_factory']
+        elif 'dash_app' in config:
+            inner = config['dash_app']
+        else:
+            raise ValueError("I only know how to build dash_component, "
+                             "dash_figure_factory and dash_app from config!", str(config))
+
+        params = inner['params'] or {}
+        plan_params = []
+        for k, v in params.items():
+            if _nested_config(v):
+                v = _PlanRef(ConfigPlan._compile(v, nodes, classes, shared, level + 1))
+            else:
+                v = _copy_param(v)
+            plan_params.append((k, v))
+
+        shared_key = None
+        if 'dash_figure_factory' in config and level > 0:
+            shared_key = shared.setdefault(_config_key(config), len(shared))
+        nodes.append(_PlanNode(
+            module=inner['module'], class_name=inner['class_name'],
+            cls=_resolve_class(inner['module'], inner['class_name'], classes),
+            params=tuple(plan_params), filepath=params.get('filepath'),
+            shared=shared_key, level=level))
+        return len(nodes) - 1
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def classes(self):
+        """tuple of the classes of all nodes, in dependency order"""
+        return tuple(node.cls for node in self._nodes)
+
+    def __getstate__(self):
+        return dict(format=_PLAN_CACHE_FORMAT, root=self._root,
+                    nodes=tuple(node._replace(cls=None) for node in self._nodes))
+
+    def __setstate__(self, state):
+        if state.get("format") != _PLAN_CACHE_FORMAT:
+            raise ValueError(f"Unknown ConfigPlan format {state.get('format')}!")
+        classes = {}
+        self._root = state['root']
+        self._nodes = tuple(node._replace(cls=_resolve_class(node.module, node.class_name, classes))
+                                for node in state['nodes'])
+
+    def instantiate(self, try_pickles=False, force_pickles=False,
+                    share_factories=True, mmap_mode=None, **update_params):
+        """
+        Builds a new instance from the plan.
+
+        Args:
+            try_pickles (bool): when finding a filepath parameter try loading from that file,
+                if it fails, load from config
+            force_pickles (bool): when finding a filepath parameter try loading from that file,
+                if it fails, raise error
+            share_factories (bool): if True, identical DashFigureFactory configs
+                only get loaded once, and the resulting instance gets
+                shared between all components. Defaults to True.
+            mmap_mode (str): when loading from file, memory-map the stored arrays
+                and DataFrames with this mode ('r' or 'c'), see DashComponentBase.from_file()
+            **update_params: kwargs that override settings in params
+
+        Returns:
+            Instance of the class defined in the config.
+        """
+        pickles = try_pickles or force_pickles
+        root = self._nodes[self._root]
+        if pickles and root.filepath is not None:
+            comp = self._load_file(root.filepath, force_pickles, mmap_mode,
+                                   "pass the correct filepath as **kwargs...")
+            if comp is not None:
+                return comp
+        factory_cache = {} if share_factories else None
+        return self._build(self._root, pickles, force_pickles, factory_cache, mmap_mode, update_params)
+
+    @staticmethod
+    def _load_file(filepath, force_pickles, mmap_mode, hint):
+        """returns DashComponentBase.from_file(filepath) or None if the file cannot be found"""
+        try:
+            return DashComponentBase.from_file(filepath, mmap_mode=mmap_mode)
+        except FileNotFoundError:
+            if force_pickles:
+                raise FileNotFoundError(
+                    f"Couldn't find {filepath}! Either change the filepath"
+                    " in the configuration or the yaml file, pass "
+                    f"force_pickles=False or try_pickles=True, or {hint}")
+            print(f"Couldn't find {filepath}! Now loading from config instead...", flush=True)
+
+    def _build(self, index, pickles, force_pickles, factory_cache, mmap_mode, update_params=None):
+        """builds the node at index, loading the nodes in its params from file when pickles"""
+        node = self._nodes[index]
+        params = {k: v if isinstance(v, _PlanRef) else _copy_param(v) for k, v in node.params}
+
+        if update_params:
+            for k, v in update_params.items():
+                if k in params:
+                    params[k] = v
+                elif 'kwargs' in params:
+                    params['kwargs'][k] = v
+                else:
+                    raise ValueError(f"This dash_oop_component does not take {k} as an argument, "
+                                    "nor does it take **kwargs!")
+
+        for k, v in params.items():
+            if isinstance(v, _PlanRef):
+                params[k] = self._build_param(v.index, pickles, force_pickles, factory_cache, mmap_mode)
+
+        kwargs = params.pop('kwargs', None) or {}
+        name = params.pop('name', None)
+        comp = node.cls(**params, **kwargs)
+        if name is not None:
+            comp.name = name
+        return comp
+
+    def _build_param(self, index, pickles, force_pickles, factory_cache, mmap_mode):
+        """returns the (shared) instance of a node in the params of another node"""
+        node = self._nodes[index]
+        if factory_cache is not None and node.shared in factory_cache:
+            return factory_cache[node.shared]
+        comp = None
+        if pickles and node.level == 1 and node.filepath is not None:
+            comp = self._load_file(node.filepath, force_pickles, mmap_mode, "pass the correct filepath")
+        if comp is None:
+            comp = self._build(index, False, False, factory_cache, mmap_mode)
+        if factory_cache is not None and node.shared is not None:
+            factory_cache[node.shared] = comp
+        return comp
+
+    @classmethod
+    def from_yaml(cls, yaml_filepath, cache=True):
+        """
+        Compiles the config in yaml_filepath. With cache=True the plan gets
+        stored in .<name>.plan.pkl beside the yaml file, keyed on the modification time,
+        size and sha256 hash of the yaml, and gets reused until the yaml changes.
+
+        Args:
+            yaml_filepath (str, Path): filepath of a .yaml file, generated from .to_yaml()
+            cache (bool): read and write the cached plan. Defaults to True.
+
+        Returns:
+            ConfigPlan
+        """
+        import pickle
+        from pathlib import Path
+        yaml_filepath = Path(yaml_filepath)
+        cache_file = yaml_filepath.with_name("." + yaml_filepath.name + ".plan.pkl")
+        stat = yaml_filepath.stat()
+        cached = None
+        if cache and cache_file.exists():
+            try:
+                with open(cache_file, "rb") as f:
+                    cached = pickle.load(f)
+            except Exception:
+                cached = None
+            if not isinstance(cached, dict):
+                cached = None
+            elif (cached['mtime_ns'], cached['size']) == (stat.st_mtime_ns, stat.st_size):
+                return cached['plan']
+
+        content = yaml_filepath.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+        if cached is not None and cached['sha256'] == sha256:
+            plan = cached['plan']
+        else:
+            plan = cls(_parse_config(content, yaml_filepath))
+        if cache:
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_file, "wb") as f:
+                    pickle.dump(dict(mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                                     sha256=sha256, plan=plan), f)
+                os.replace(tmp_file, cache_file)
+            except (OSError, pickle.PicklingError):
+                if tmp_file.exists():
+                    tmp_file.unlink()
+        return plan
+
 # Cell
 
+_factory_seconds = contextvars.ContextVar("dash_oop_factory_seconds", default=None)
+_factory_depth = contextvars.ContextVar("dash_oop_factory_depth", default=0)
+
+def _timed_factory_method(method):
+    """wraps a public DashFigureFactory method, so that while a callback is being
+    profiled (see CallbackProfiler) the time spent inside the method gets added
+    to the factory time of the callback. Nested factory calls only count once.
+
+    Methods only get wrapped once a CallbackProfiler has been created in this
+    process, so without profiling factory methods do not get any overhead."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        seconds = _factory_seconds.get()
+        if seconds is None or _factory_depth.get():
+            return method(self, *args, **kwargs)
+        token = _factory_depth.set(1)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            seconds[0] += time.perf_counter() - start
+            _factory_depth.reset(token)
+    wrapper._factory_timed = True
+    return wrapper
+
+
 class DashFigureFactory(DashComponentBase):
     """
     Helper class to store data for a dashboard and provide e.g. plotting functions.
@@ -313,12 +1123,692 @@ class DashFigureFactory(DashComponentBase):
     def __init__(self, no_store=None, no_attr=None, no_config=None):
         super().__init__(no_store=None, no_attr=None, no_config=None)
 
+    _time_methods = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if DashFigureFactory._time_methods:
+            cls._wrap_timed_methods()
+
+    @classmethod
+    def _wrap_timed_methods(cls):
+        """wraps the public methods of cls and all its subclasses with _timed_factory_method"""
+        for name, method in list(cls.__dict__.items()):
+            if (not name.startswith("_") and inspect.isfunction(method)
+                    and not getattr(method, "_factory_timed", False)):
+                setattr(cls, name, _timed_factory_method(method))
+        for subclass in cls.__subclasses__():
+            subclass._wrap_timed_methods()
+
+    @staticmethod
+    def _enable_method_timing():
+        """from now on time the public methods of all (existing and future) subclasses"""
+        if not DashFigureFactory._time_methods:
+            DashFigureFactory._time_methods = True
+            for subclass in DashFigureFactory.__subclasses__():
+                subclass._wrap_timed_methods()
+
     def to_config(self):
         return dict(dash_figure_factory=dict(
             class_name=self.__class__.__name__,
             module=self.__class__.__module__,
             params=self._stored_params))
 
+    def _cached_methods(self):
+        """returns dict of method name to the caches of all methods decorated with @figure_cache"""
+        return {name: getattr(type(self), name)._figure_caches for name in dir(type(self))
+                    if hasattr(getattr(type(self), name, None), "_figure_caches")}
+
+    def cache_info(self):
+        """returns a dict with for each method decorated with @figure_cache
+        a dict with the hits, misses, maxsize, ttl and currsize of its cache."""
+        return {name: caches[self].info() if self in caches else None
+                    for name, caches in self._cached_methods().items()}
+
+    def invalidate_cache(self, method_name=None):
+        """clears the caches of all methods decorated with @figure_cache,
+        or only the cache of method_name."""
+        for name, caches in self._cached_methods().items():
+            if (method_name is None or name == method_name) and self in caches:
+                caches[self].invalidate()
+
+    def after_fork(self):
+        """re-initializes the locks of all @figure_cache caches in a forked process"""
+        for caches in self._cached_methods().values():
+            if self in caches:
+                caches[self].after_fork()
+
+
+# Cell
+class CacheBackend(ABC):
+    """Base class for the storage backends of FigureCache.
+
+    Values are json strings, and get stored together with the (unix) time at which
+    they were stored. Keys are strings of the form 'namespace/hash'.
+    """
+    shared = False # whether the backend is shared between processes
+
+    @abstractmethod
+    def get(self, key):
+        """returns tuple(value, timestamp) or None if key is not stored"""
+
+    @abstractmethod
+    def set(self, key, value):
+        """stores value under key, together with the current time"""
+
+    @abstractmethod
+    def delete(self, key):
+        """deletes the entry of key, if stored"""
+
+    @abstractmethod
+    def clear(self, namespace=None):
+        """deletes all entries, or only the entries of namespace"""
+
+    @abstractmethod
+    def count(self, namespace=None):
+        """returns the number of entries, or only the number of entries of namespace"""
+
+    def after_fork(self):
+        """re-initializes locks and connections in a forked (worker) process"""
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend. This is the default backend of every FigureCache."""
+    def __init__(self, maxsize=None):
+        """
+        Args:
+            maxsize (int): maximum number of entries, least recently used get
+                evicted first. If None, unlimited.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, namespace=None):
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k.startswith(namespace + "/")]:
+                    del self._entries[key]
+
+    def count(self, namespace=None):
+        if namespace is None:
+            return len(self._entries)
+        return sum(1 for k in list(self._entries) if k.startswith(namespace + "/"))
+
+    def after_fork(self):
+        # the lock might have been held by another thread of the parent process:
+        self._lock = threading.Lock()
+
+
+class DiskCacheBackend(CacheBackend):
+    """Backend that stores zlib compressed entries in a sqlite database on disk,
+    so that all (gunicorn) worker processes on a machine share the same cache.
+    sqlite takes care of the file locking. Entries persist between restarts."""
+    shared = True
+
+    def __init__(self, path="figure_cache.sqlite", maxsize=None):
+        """
+        Args:
+            path (str, Path): location of the sqlite database. Defaults to 'figure_cache.sqlite'
+            maxsize (int): maximum number of entries, oldest get evicted first.
+                If None, unlimited.
+        """
+        self.path = str(path)
+        self.maxsize = maxsize
+        self._local = threading.local()
+
+    def _connection(self):
+        """returns a sqlite connection for the current thread and process"""
+        if getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS figure_cache "
+                         "(key TEXT PRIMARY KEY, value BLOB, timestamp REAL)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return self._local.conn
+
+    def __getstate__(self):
+        return dict(path=self.path, maxsize=self.maxsize)
+
+    def after_fork(self):
+        # sqlite connections should never be shared with the parent process:
+        self._local = threading.local()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value, timestamp FROM figure_cache WHERE key=?", (key,)).fetchone()
+        if row is not None:
+            return zlib.decompress(row[0]).decode("utf8"), row[1]
+
+    def set(self, key, value):
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO figure_cache VALUES (?, ?, ?)",
+                     (key, zlib.compress(value.encode("utf8")), time.time()))
+        if self.maxsize is not None:
+            conn.execute("DELETE FROM figure_cache WHERE key NOT IN "
+                         "(SELECT key FROM figure_cache ORDER BY timestamp DESC LIMIT ?)", (self.maxsize,))
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM figure_cache WHERE key=?", (key,))
+
+    def clear(self, namespace=None):
+        if namespace is None:
+            self._connection().execute("DELETE FROM figure_cache")
+        else:
+            self._connection().execute("DELETE FROM figure_cache WHERE substr(key, 1, ?)=?",
+                                       (len(namespace) + 1, namespace + "/"))
+
+    def count(self, namespace=None):
+        if namespace is None:
+            return self._connection().execute("SELECT COUNT(*) FROM figure_cache").fetchone()[0]
+        return self._connection().execute("SELECT COUNT(*) FROM figure_cache WHERE substr(key, 1, ?)=?",
+                                          (len(namespace) + 1, namespace + "/")).fetchone()[0]
+
+
+class SharedMemoryCacheBackend(CacheBackend):
+    """Backend that stores zlib compressed entries in a single named
+    multiprocessing.shared_memory block, so that all worker processes on a
+    machine share the same cache without touching disk.
+
+    The block is divided into a fixed number of slots of a fixed size, and every
+    key maps to a single slot (a direct-mapped cache), so a new entry overwrites
+    whatever entry was in its slot before. Entries that do not fit in a slot
+    do not get cached. Every slot carries a checksum over both its header and
+    its payload, so a slot that is being overwritten by another process (or
+    a header that got paired with the payload of another key) simply reads
+    as a miss.
+
+    When starting gunicorn with --preload, the block gets created in the master
+    process before forking, and gets removed when the master exits.
+    """
+    shared = True
+    _header = struct.Struct("<QQdII") # key hash, namespace hash, timestamp, length, crc32
+    _checked = struct.Struct("<QQdI") # the part of the header covered by the crc32
+
+    def __init__(self, name="dash_oop_figure_cache", slots=256, slot_size=2**20):
+        """
+        Args:
+            name (str): name of the shared memory block. Defaults to 'dash_oop_figure_cache'
+            slots (int): number of entries that can be stored. Defaults to 256.
+            slot_size (int): maximum size in bytes of a single (compressed) entry.
+                Defaults to 1MB.
+        """
+        from multiprocessing import shared_memory
+        self.name, self.slots, self.slot_size = name, slots, slot_size
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=slots * slot_size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if hasattr(self._shm, "_name"):
+                # only the process that created the block should unlink it upon exit:
+                try:
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(self._shm._name, "shared_memory")
+                except Exception:
+                    pass
+            if self._shm.size < slots * slot_size:
+                raise ValueError(f"Shared memory block {name} already exists with a different size!")
+
+    def __getstate__(self):
+        return dict(name=self.name, slots=self.slots, slot_size=self.slot_size)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def _hash(s):
+        return int.from_bytes(hashlib.blake2b(s.encode("utf8"), digest_size=8).digest(), "little")
+
+    def _hashes(self, key):
+        """returns (slot offset, key hash, namespace hash) of key"""
+        key_hash = self._hash(key)
+        return (key_hash % self.slots) * self.slot_size, key_hash, self._hash(key.rsplit("/", 1)[0])
+
+    def _crc(self, key_hash, namespace_hash, timestamp, data):
+        """crc32 over the header fields and the payload of a slot"""
+        return zlib.crc32(data, zlib.crc32(
+            self._checked.pack(key_hash, namespace_hash, timestamp, len(data))))
+
+    def get(self, key):
+        offset, key_hash, _ = self._hashes(key)
+        buf = self._shm.buf
+        slot_key, namespace_hash, timestamp, length, crc = self._header.unpack_from(buf, offset)
+        if slot_key != key_hash or length == 0 or length > self.slot_size - self._header.size:
+            return None
+        start = offset + self._header.size
+        data = bytes(buf[start:start + length])
+        if self._crc(key_hash, namespace_hash, timestamp, data) != crc:
+            return None
+        return zlib.decompress(data).decode("utf8"), timestamp
+
+    def set(self, key, value):
+        offset, key_hash, namespace_hash = self._hashes(key)
+        data = zlib.compress(value.encode("utf8"))
+        if len(data) > self.slot_size - self._header.size:
+            return
+        buf = self._shm.buf
+        self._header.pack_into(buf, offset, 0, 0, 0.0, 0, 0)
+        start = offset + self._header.size
+        buf[start:start + len(data)] = data
+        timestamp = time.time()
+        self._header.pack_into(buf, offset, key_hash, namespace_hash, timestamp, len(data),
+                               self._crc(key_hash, namespace_hash, timestamp, data))
+
+    def delete(self, key):
+        offset, key_hash, _ = self._hashes(key)
+        if self._header.unpack_from(self._shm.buf, offset)[0] == key_hash:
+            self._header.pack_into(self._shm.buf, offset, 0, 0, 0.0, 0, 0)
+
+    def _slot_headers(self):
+        for offset in range(0, self.slots * self.slot_size, self.slot_size):
+            yield offset, self._header.unpack_from(self._shm.buf, offset)
+
+    def clear(self, namespace=None):
+        namespace_hash = None if namespace is None else self._hash(namespace)
+        for offset, (_, slot_namespace, _, length, _) in self._slot_headers():
+            if length and (namespace_hash is None or slot_namespace == namespace_hash):
+                self._header.pack_into(self._shm.buf, offset, 0, 0, 0.0, 0, 0)
+
+    def count(self, namespace=None):
+        namespace_hash = None if namespace is None else self._hash(namespace)
+        return sum(1 for _, (_, slot_namespace, _, length, _) in self._slot_headers()
+                        if length and (namespace_hash is None or slot_namespace == namespace_hash))
+
+    def unlink(self):
+        """removes the shared memory block from the system"""
+        self._shm.close()
+        self._shm.unlink()
+
+
+_figure_cache_backend = None
+
+def set_figure_cache_backend(backend=None):
+    """Sets the backend that all @figure_cache decorated DashFigureFactory
+    methods in this process use to store their outputs.
+
+    Args:
+        backend (str, dict, CacheBackend): either None or 'memory' (seperate
+            in-process cache for every factory, the default), 'disk' (DiskCacheBackend),
+            'shared_memory' (SharedMemoryCacheBackend), a dict with a 'backend' key
+            plus parameters for the backend (e.g. dict(backend='disk', path='cache.sqlite'))
+            or a CacheBackend instance.
+
+    Returns:
+        CacheBackend or None
+    """
+    global _figure_cache_backend
+    backends = dict(memory=None, disk=DiskCacheBackend, shared_memory=SharedMemoryCacheBackend)
+    if isinstance(backend, dict):
+        kwargs = dict(backend)
+        backend = kwargs.pop('backend', 'memory')
+    else:
+        kwargs = {}
+    if backend is None or isinstance(backend, CacheBackend):
+        _figure_cache_backend = backend
+    elif backend in backends:
+        _figure_cache_backend = backends[backend](**kwargs) if backends[backend] is not None else None
+    else:
+        raise ValueError(f"Unknown figure cache backend {backend}! "
+                         f"Should be one of {list(backends.keys())}, a dict or a CacheBackend.")
+    return _figure_cache_backend
+
+
+def get_figure_cache_backend():
+    """returns the backend set with set_figure_cache_backend(), or None when every
+    factory uses its own in-process cache"""
+    return _figure_cache_backend
+
+# Cell
+class FigureCache:
+    """Thread-safe LRU cache with an optional time-to-live, that stores
+    serialized (json) outputs of DashFigureFactory methods.
+
+    By default entries get stored in-process in a MemoryCacheBackend. When a
+    shared backend has been set with set_figure_cache_backend() (e.g. by passing
+    cache_backend='disk' to DashApp), entries get stored there instead, so that they
+    can be re-used by other processes. Keys are then prefixed with namespace,
+    which should identify the factory and method.
+
+    Keeps track of hits and misses, and can be cleared with .invalidate()
+    """
+    def __init__(self, maxsize=128, ttl=None, namespace="", backend=None):
+        """
+        Args:
+            maxsize (int): maximum number of entries to store in memory. If None, unlimited.
+                Shared backends have their own maxsize.
+            ttl (float): number of seconds after which an entry expires. If None,
+                entries never expire.
+            namespace (str): prefix for all keys of this cache
+            backend (CacheBackend): backend to use. Defaults to None, in which case
+                the backend set by set_figure_cache_backend() or else an in-memory
+                backend gets used.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.namespace = namespace
+        self.hits, self.misses = 0, 0
+        self._backend = backend
+        self._memory = MemoryCacheBackend(maxsize)
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is not None:
+            return self._backend
+        if _figure_cache_backend is not None:
+            return _figure_cache_backend
+        return self._memory
+
+    def _key(self, key):
+        return self.namespace + "/" + hashlib.sha1(repr(key).encode("utf8")).hexdigest()
+
+    def get(self, key):
+        """returns tuple(hit, value). If not hit, value is None"""
+        backend, key = self.backend, self._key(key)
+        entry = backend.get(key)
+        if entry is not None and self.ttl is not None and time.time() - entry[1] >= self.ttl:
+            backend.delete(key)
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        return True, entry[0]
+
+    def set(self, key, value):
+        """stores value under key. Returns value."""
+        self.backend.set(self._key(key), value)
+        return value
+
+    def invalidate(self):
+        """clears all entries (hits and misses counters are kept)"""
+        self.backend.clear(self.namespace)
+
+    def __len__(self):
+        return self.backend.count(self.namespace)
+
+    def info(self):
+        return dict(hits=self.hits, misses=self.misses, maxsize=self.maxsize,
+                    ttl=self.ttl, currsize=len(self))
+
+    def after_fork(self):
+        """re-initializes the locks of the cache and its backend in a forked process"""
+        self._lock = threading.Lock()
+        self._memory.after_fork()
+        if self._backend is not None:
+            self._backend.after_fork()
+
+
+def figure_cache(maxsize=128, ttl=None):
+    """Decorator: memoize the output of a DashFigureFactory method.
+
+    The output gets serialized to json (figures with their .to_plotly_json()),
+    and the cached method returns the deserialized json: e.g. a figure gets
+    returned as the dict that dash would send to the browser anyway.
+
+    Arguments get normalized (lists turned into tuples, etc) so that
+    e.g. plot_time_series(['Italy', 'Spain'], 'cases') and
+    plot_time_series(countries=('Italy', 'Spain'), metric='cases') share an entry.
+
+    Each factory instance gets its own cache. Use factory.cache_info() to get
+    hits/misses and factory.invalidate_cache() to clear them.
+
+    With a shared backend (see set_figure_cache_backend()) factories with the same
+    class and config params share their entries across processes. Params and
+    arguments get compared by their full content (e.g. every row of a DataFrame).
+    Factories with params whose content cannot be hashed (e.g. plain objects) only
+    get cached in-process, and calls with such arguments do not get cached.
+
+    Example:
+        class CovidPlots(DashFigureFactory):
+            @figure_cache(maxsize=256, ttl=3600)
+            def plot_time_series(self, countries, metric):
+                ...
+
+    Args:
+        maxsize (int): maximum number of cached outputs per instance. Defaults to 128.
+        ttl (float): number of seconds after which a cached output expires.
+            Defaults to None (never expire).
+    """
+    if callable(maxsize):
+        return figure_cache()(maxsize)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        caches = weakref.WeakKeyDictionary()
+        caches_lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with caches_lock:
+                if self not in caches:
+                    record = self.__dict__.get("_record")
+                    namespace = f"{type(self).__module__}.{type(self).__qualname__}.{func.__name__}"
+                    try:
+                        params_hash = _content_hash(dict(record.items()) if record is not None else {})
+                    except TypeError as e:
+                        # entries of factories whose params cannot be told apart by content
+                        # should never be shared, so these only get cached in this process:
+                        print(f"Warning: {namespace} only gets cached in-process: {e}")
+                        caches[self] = FigureCache(maxsize, ttl, namespace, MemoryCacheBackend(maxsize))
+                    else:
+                        caches[self] = FigureCache(maxsize, ttl, f"{namespace}:{params_hash}")
+                cache = caches[self]
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            try:
+                key = _content_hash(list(bound.arguments.items())[1:])
+            except TypeError:
+                # arguments that cannot be hashed by content do not get cached:
+                return json.loads(json.dumps(func(self, *args, **kwargs), cls=PlotlyJSONEncoder))
+            hit, value = cache.get(key)
+            if not hit:
+                value = cache.set(key, json.dumps(func(self, *args, **kwargs), cls=PlotlyJSONEncoder))
+            return json.loads(value)
+        wrapper._figure_caches = caches
+        return wrapper
+    return decorator
+
+# Cell
+class CallbackProfiler:
+    """Thread-safe statistics of the callbacks of DashComponents in this process.
+
+    For every callback (labeled with the class and .name of the component that
+    registered it, and the name of the callback function) keeps track of the
+    number of calls and errors, the total and maximum wall time, the time spent
+    inside DashFigureFactory methods (summed over threads) and the total size
+    of the responses sent to the browser.
+
+    Gets created by DashApp(profile_callbacks=True), see DashApp.callback_stats().
+    """
+    _metrics = [
+        ("calls", "calls_total", "counter", "Number of calls of the callback"),
+        ("errors", "errors_total", "counter", "Number of calls that raised an exception"),
+        ("seconds", "seconds_total", "counter", "Total wall time of the callback"),
+        ("max_seconds", "seconds_max", "gauge", "Maximum wall time of a single call"),
+        ("factory_seconds", "factory_seconds_total", "counter", "Total time spent in DashFigureFactory methods"),
+        ("payload_bytes", "payload_bytes_total", "counter", "Total size of the responses of the callback"),
+    ]
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        DashFigureFactory._enable_method_timing()
+
+    def _new_stats(self):
+        return dict(calls=0, errors=0, seconds=0.0, max_seconds=0.0, factory_seconds=0.0, payload_bytes=0)
+
+    def wrap(self, func, component, callback_name=None):
+        """returns func wrapped so that its calls get recorded under the label
+        (component class, component name, callback_name)"""
+        key = (component.__class__.__name__, str(getattr(component, "name", "")),
+               callback_name or func.__name__)
+        with self._lock:
+            self._stats.setdefault(key, self._new_stats())
+
+        @functools.wraps(func)
+        def profiled_callback(*args, **kwargs):
+            factory_seconds = [0.0]
+            token = _factory_seconds.set(factory_seconds)
+            error, start = False, time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except PreventUpdate:
+                raise
+            except Exception:
+                error = True
+                raise
+            finally:
+                self._record(key, time.perf_counter() - start, factory_seconds[0], error)
+                _factory_seconds.reset(token)
+                if flask.has_request_context():
+                    flask.g.dash_oop_callback = key
+        return profiled_callback
+
+    def instrument(self, app, component):
+        """returns a proxy of app that profiles all callbacks registered with .callback()"""
+        return _ProfiledApp(app, self, component)
+
+    def _record(self, key, seconds, factory_seconds, error=False):
+        with self._lock:
+            stats = self._stats.setdefault(key, self._new_stats())
+            stats["calls"] += 1
+            stats["errors"] += error
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["factory_seconds"] += factory_seconds
+
+    def record_payload(self, key, num_bytes):
+        with self._lock:
+            self._stats.setdefault(key, self._new_stats())["payload_bytes"] += num_bytes
+
+    def register_payload_hook(self, server):
+        """records the size of every callback response of the flask server"""
+        @server.after_request
+        def record_callback_payload(response):
+            key = flask.g.pop("dash_oop_callback", None)
+            if key is not None:
+                self.record_payload(key, response.calculate_content_length() or 0)
+            return response
+
+    def stats(self):
+        """returns a list of dicts with the component, name, callback and statistics
+        of every callback, sorted by total wall time (slowest first)"""
+        with self._lock:
+            stats = [dict(component=component, name=name, callback=callback, **values,
+                          mean_seconds=values["seconds"] / values["calls"] if values["calls"] else 0.0)
+                        for (component, name, callback), values in self._stats.items()]
+        return sorted(stats, key=lambda s: s["seconds"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self):
+        """returns the statistics in the prometheus text exposition format"""
+        def escape(label):
+            return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        stats = self.stats()
+        lines = []
+        for key, metric, metric_type, help_text in self._metrics:
+            lines.append(f"# HELP dash_oop_callback_{metric} {help_text}")
+            lines.append(f"# TYPE dash_oop_callback_{metric} {metric_type}")
+            for s in stats:
+                labels = (f'component="{escape(s["component"])}",name="{escape(s["name"])}",'
+                          f'callback="{escape(s["callback"])}"')
+                lines.append(f"dash_oop_callback_{metric}{{{labels}}} {s[key]}")
+        return "\n".join(lines) + "\n"
+
+
+class _ProfiledApp:
+    """proxy of a dash app that profiles every callback registered with .callback()"""
+    def __init__(self, app, profiler, component):
+        self._app, self._profiler, self._component = app, profiler, component
+
+    def callback(self, *args, **kwargs):
+        register = self._app.callback(*args, **kwargs)
+        def decorator(func):
+            return register(self._profiler.wrap(func, self._component))
+        return decorator
+
+    def __getattr__(self, attr):
+        return getattr(self._app, attr)
+
+# Cell
+
+_layout_render = contextvars.ContextVar("dash_oop_layout_render", default=None)
+_layout_producing = contextvars.ContextVar("dash_oop_layout_producing", default=None)
+
+class _LayoutRender:
+    """state of a single DashComponent.render_layout() call: the params, the futures
+    of the subcomponent layouts that are being rendered in the thread pool, and the
+    subcomponents whose layout got asked for with params"""
+    def __init__(self, params):
+        self.params = params
+        self.futures = {}
+        self.requested = []
+
+
+def _produce_layout(comp, params):
+    """renders comp.layout(params) in a thread pool thread"""
+    _layout_producing.set(comp)
+    return comp.layout(params)
+
+
+def _render_aware_layout(layout):
+    """wraps the layout method of a DashComponent subclass, so that during
+    render_layout() a subcomponent layout that has already been rendered in the
+    thread pool gets returned instead of being rendered again.
+
+    Outside of render_layout() the wrapper simply calls layout. Layouts only get
+    wrapped once render_layout() gets called with an executor (e.g. by
+    DashApp(layout_threads=...)), so otherwise layouts do not get any overhead."""
+    @functools.wraps(layout)
+    def wrapper(self, *args, **kwargs):
+        render = _layout_render.get()
+        if render is None or _layout_producing.get() is self:
+            return layout(self, *args, **kwargs)
+        params = args[0] if args else kwargs.get("params")
+        if params is not render.params and params != render.params:
+            return layout(self, *args, **kwargs)
+        render.requested.append(self)
+        future = render.futures.get(id(self))
+        # a future that has not started yet gets cancelled and rendered right here,
+        # so that threads never wait for layouts that are still queued behind them:
+        if future is not None and not future.cancel():
+            return future.result()
+        token = _layout_producing.set(self)
+        try:
+            return layout(self, *args, **kwargs)
+        finally:
+            _layout_producing.reset(token)
+    wrapper._render_aware = True
+    return wrapper
 
 # Cell
 
@@ -345,6 +1835,11 @@ class DashComponent(DashComponentBase):
         DashComponent will register callbacks of subcomponents in addition
         to _register_callbacks() when calling register_callbacks()
     """
+    # querystring params get discovered for the whole tree in a single pass the first
+    # time that they are needed (see .discover_querystring_params()), and DashFigureFactory
+    # params get stored to config as their .to_config()
+    _record_class, _config_param_types = _ComponentRecord, (DashFigureFactory,)
+
     def __init__(self, title="Dash", name=None,
                  no_store=None, no_attr=None, no_config=None):
         """initialize the DashComponent
@@ -353,32 +1848,124 @@ class DashComponent(DashComponentBase):
             title (str, optional): Title of component. Defaults to "Dash".
             name (str, optional): unique name to add to Component elements.
                         If None then random uuid is generated to make sure
-                        it's unique. Defaults to None.
+                        it's unique (or a deterministic name, see
+                        set_naming_mode()). Defaults to None.
         """
         super().__init__(no_store, no_attr, no_config)
-        self._convert_ff_config_params()
 
         self.title = title
         if not hasattr(self, "name"):
             self.name = name
         if self.name is None:
             self._generate_uuid_name()
-        self._stored_params["name"] = self.name
+        self.name = _intern(self.name)
+        self._record.set("name", self.name)
 
-        self._components = []
-        self.compute_querystring_params(whole_tree=False)
+    _render_aware_layouts = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _dash_component_classes.add(cls)
+        if DashComponent._render_aware_layouts:
+            cls._wrap_render_aware_layout()
+
+    @classmethod
+    def _wrap_render_aware_layout(cls):
+        """wraps the layout of cls and all its subclasses with _render_aware_layout"""
+        layout = cls.__dict__.get("layout")
+        if callable(layout) and not getattr(layout, "_render_aware", False):
+            cls.layout = _render_aware_layout(layout)
+        for subclass in cls.__subclasses__():
+            subclass._wrap_render_aware_layout()
+
+    @staticmethod
+    def _enable_render_aware_layouts():
+        """from now on wrap the layouts of all (existing and future) subclasses, so
+        that they pick up layouts that got rendered by render_layout() in a thread pool"""
+        if not DashComponent._render_aware_layouts:
+            DashComponent._render_aware_layouts = True
+            for subclass in DashComponent.__subclasses__():
+                subclass._wrap_render_aware_layout()
+
+    def __setattr__(self, name, value):
+        # gets called for every attribute assignment, so keep the common path short:
+        if type(value) in _dash_component_classes:
+            # the registered subcomponents of self and all tree indexes are out of date
+            global _tree_generation
+            _tree_generation = next(_tree_generations)
+            record = self.__dict__.get('_record')
+            if record is not None:
+                record.scanned = False
+        object.__setattr__(self, name, value)
+
+    @property
+    def _querystring_params(self):
+        """tuple of the (id, attr) querystring params of self, None when not discovered yet"""
+        return self._record.querystring_params
+
+    @_querystring_params.setter
+    def _querystring_params(self, params):
+        self._record.querystring_params = None if params is None else tuple(params)
+
+    @property
+    def _components(self):
+        """tuple of the registered subcomponents, see .register_components()"""
+        return self._record.components
+
+    @_components.setter
+    def _components(self, components):
+        global _tree_generation
+        _tree_generation = next(_tree_generations)
+        self._record.components = tuple(components)
+
+    @property
+    def _tab_params(self):
+        """dict of DashComponentTabs id to dict of tab name to its querystring params"""
+        if self._record.tab_params is None:
+            raise AttributeError(f"{self.__class__.__name__} has no _tab_params")
+        return self._record.tab_params
+
+    @_tab_params.setter
+    def _tab_params(self, tab_params):
+        self._record.tab_params = tab_params
 
 
-    def _generate_uuid_name(self):
-        self.name = str(shortuuid.ShortUUID().random(length=10))
 
+    def _generate_uuid_name(self):
+        if _naming_mode == "deterministic":
+            self._generate_deterministic_name()
+        else:
+            self.name = str(shortuuid.ShortUUID().random(length=10))
+
+    def _constructing_parent(self):
+        """returns the DashComponent whose __init__ is constructing self, or None"""
+        frame = sys._getframe(1)
+        while frame is not None:
+            if frame.f_code.co_name == "__init__":
+                obj = frame.f_locals.get("self")
+                if isinstance(obj, DashComponent) and obj is not self:
+                    return obj
+            frame = frame.f_back
+        return None
 
-    def _convert_ff_config_params(self):
-        """convert any DashFigureFactory in the ._stored_params dict to its config"""
-        for k, v in self._stored_params.items():
-            if isinstance(v, DashFigureFactory):
-                self._stored_params[k] = self._stored_params[k].to_config()
+    def _generate_deterministic_name(self):
+        """generates a name from a stable hash of the position of self in the tree
+        of components under construction, its class and its params. Siblings with
+        the same class and params get numbered in order of construction."""
+        record = self.__dict__.get("_record")
+        params = {k: v for k, v in (record.items(self._config_param_types) if record is not None else [])
+                    if k != "name"}
+        key = f"{self.__class__.__module__}.{self.__class__.__qualname__}{_stable_repr(params)}"
+        parent = self._constructing_parent()
+        if parent is None:
+            counts, parent_path = _root_name_counts, ""
+        else:
+            counts = parent.__dict__.setdefault("_child_name_counts", {})
+            parent_path = parent.__dict__.get("_tree_path") or f"name:{getattr(parent, 'name', None)}"
+        counts[key] = counts.get(key, -1) + 1
+        self._tree_path = hashlib.blake2b(
+            f"{parent_path}/{key}[{counts[key]}]".encode(), digest_size=16).hexdigest()
+        self.name = self._tree_path[:10]
 
     @staticmethod
     def make_hideable(element, hide=False):
@@ -393,7 +1980,9 @@ class DashComponent(DashComponentBase):
                         a hidden html.Div instead. Defaults to False.
         """
         if hide:
-            if isinstance(element, dbc.Col) or isinstance(element, dbc.Row):
+            # element can only be a dbc.Col or dbc.Row when dbc has been imported:
+            dbc = sys.modules.get("dash_bootstrap_components")
+            if dbc is not None and (isinstance(element, dbc.Col) or isinstance(element, dbc.Row)):
                 return html.Div(element.children, style=dict(display="none"))
             else:
                 return html.Div(element, style=dict(display="none"))
@@ -444,8 +2033,13 @@ class DashComponent(DashComponentBase):
             attrs = move_value_to_front(attrs)
             def wrapper(func):
                 def apply_value(*args, **kwargs):
+                    record = self._record
+                    stored = record.querystring_params or ()
                     for attr in attrs:
-                        self._querystring_params.append(tuple([kwargs['id'], attr]))
+                        param = (_intern(kwargs['id']), _intern(attr))
+                        if param not in stored:
+                            stored += (param,)
+                    record.querystring_params = stored
                     return func(*args, **kwargs)
                 return apply_value
             return wrapper
@@ -470,14 +2064,18 @@ class DashComponent(DashComponentBase):
         """
         Returns a list of tuple(id, attribute) of all element attributes
         in all (sub-)components that have been wrapped by self.querystring()
-        and should be tracked in the url querystring."""
+        and should be tracked in the url querystring.
 
-        _params = []
-        _params.extend(self._querystring_params)
+        If the params have not been discovered yet, runs
+        .discover_querystring_params() first."""
+        if self._record.querystring_params is None:
+            self.discover_querystring_params()
 
-        self.register_components()
-        for comp in self._components:
-            _params.extend(comp.get_querystring_params())
+        _params = []
+        for comp in self._tree_index().components:
+            if comp._record.querystring_params is None:
+                comp.discover_querystring_params()
+            _params.extend(comp._record.querystring_params)
         return _params
 
     def _clear_querystring_params(self, whole_tree=True):
@@ -486,31 +2084,108 @@ class DashComponent(DashComponentBase):
         Args:
             whole_tree (bool): if True, clear all _querystring_prams\
                 in all subcomponents."""
-        self._querystring_params = []
+        for comp in self._tree_index().components if whole_tree else (self,):
+            comp._record.querystring_params = ()
+
+    def _tree_index(self):
+        """returns the _TreeIndex of self and all (nested) subcomponents. Gets
+        built once and rebuilt only after a DashComponent got assigned
+        to an attribute of any DashComponent."""
+        record = self._record
+        if record.tree is None or record.tree.generation != _tree_generation:
+            record.tree = _TreeIndex(self)
+        return record.tree
+
+    def _tree_components(self):
+        """returns a list of self and all (nested) subcomponents, parents first"""
+        return list(self._tree_index().components)
+
+    def discover_querystring_params(self, raise_errors=False):
+        """computes ._querystring_params of self and all subcomponents in a
+        single instrumented pass over the tree and returns the unreachable params.
+
+        First self.layout("_store_querystring_params") gets called once: all
+        params that get stored in this pass are reachable. The layout of
+        subcomponents that did not receive the params from their parent then
+        gets called once separately in order to find the unreachable params.
+        Finally the tab membership in ._tab_params gets updated.
 
-        if whole_tree:
-            self.register_components()
-            for comp in self._components:
-                comp._clear_querystring_params(whole_tree)
+        Args:
+            raise_errors (bool): if True, raise errors in self.layout() instead
+                of ignoring them.
+
+        Returns:
+            list of (id, attr) params that have a self.querystring() wrapper,
+            but do not get passed params from the layout of their parent. See
+            .get_unreachable_querystring_params()
+        """
+        tree = self._tree_components()
+        for comp in tree:
+            comp._record.querystring_params = ()
+
+        stored, instance_layouts = set(), {}
+        def instrument(comp):
+            if "layout" in comp.__dict__:
+                instance_layouts[id(comp)] = comp.__dict__["layout"]
+            layout = comp.layout
+            def instrumented_layout(*args, **kwargs):
+                params = args[0] if args else kwargs.get("params")
+                if isinstance(params, str) and params == "_store_querystring_params":
+                    stored.add(id(comp))
+                return layout(*args, **kwargs)
+            comp.layout = instrumented_layout
+
+        for comp in tree:
+            instrument(comp)
+        try:
+            try:
+                self.layout("_store_querystring_params")
+            except:
+                if raise_errors:
+                    raise
+            reachable_params = set(self.get_querystring_params())
+
+            for comp in tree:
+                if id(comp) not in stored:
+                    try:
+                        comp.layout("_store_querystring_params")
+                    except:
+                        pass
+        finally:
+            for comp in tree:
+                if id(comp) in instance_layouts:
+                    comp.layout = instance_layouts[id(comp)]
+                else:
+                    del comp.layout
+
+        by_name = {comp.name: comp for comp in tree}
+        for comp in tree:
+            for tab_params in getattr(comp, "_tab_params", {}).values():
+                for tab_name in tab_params:
+                    if tab_name in by_name:
+                        tab_params[tab_name] = by_name[tab_name].get_querystring_params()
+
+        return [param for param in self.get_querystring_params()
+                    if param not in reachable_params]
 
     def compute_querystring_params(self, whole_tree=True):
         """compute ._querystring_params.
 
         Args:
             whole_tree (bool): if True, compute all _querystring_prams\
-                in all subcomponents."""
-        self._querystring_params = []
+                in all subcomponents in a single pass with
+                .discover_querystring_params()"""
+        if whole_tree:
+            self.discover_querystring_params()
+            return
+
+        self._record.querystring_params = ()
 
         try:
             self.layout("_store_querystring_params")
         except:
             pass
 
-        if whole_tree:
-            self.register_components()
-            for comp in self._components:
-                comp.compute_querystring_params(whole_tree)
-
     def get_unreachable_querystring_params(self):
         """returns all element (id, attr) querystring parameters
         that have a self.querystring() wrapper but because params
@@ -518,20 +2193,11 @@ class DashComponent(DashComponentBase):
         function, will not actually get updated.
         """
         try:
-            _ = self.layout(None)
+            return self.discover_querystring_params(raise_errors=True)
         except:
+            self.discover_querystring_params()
             return self.get_querystring_params()
 
-        self._clear_querystring_params(whole_tree=True)
-        _ = self.layout("_store_querystring_params")
-        reachable_params = self.get_querystring_params()
-
-        self.compute_querystring_params(whole_tree=True)
-        all_params = self.get_querystring_params()
-
-        unreachable_params = [param for param in all_params if param not in reachable_params]
-        return unreachable_params
-
     def id(self, component_id):
         if self.name is None:
             self._generate_uuid_name()
@@ -555,13 +2221,26 @@ class DashComponent(DashComponentBase):
     def register_components(self):
         """register subcomponents so that their callbacks will be registered
 
-        Searches self.__dict__, finds all DashComponents and adds them to self._components
+        Searches self.__dict__, finds all DashComponents and adds them to self._components.
+        Only searches again after a DashComponent got assigned to an attribute.
         """
-        if not hasattr(self, '_components'):
-            self._components = []
-        for k, v in self.__dict__.items():
-            if k != '_components' and isinstance(v, DashComponent) and v not in self._components:
-                self._components.append(v)
+        record = self._record
+        if record.scanned:
+            return
+        registered = set(map(id, record.components))
+        new = []
+        for v in self.__dict__.values():
+            if isinstance(v, DashComponent) and id(v) not in registered:
+                registered.add(id(v))
+                new.append(v)
+        if new:
+            record.components += tuple(new)
+        record.scanned = True
+
+    def _registered_components(self):
+        """returns tuple of the registered subcomponents, after registering any new ones"""
+        self.register_components()
+        return self._record.components
 
     def tabs(self, params, id, tabs):
         return dcc.Tabs(id=id, value=id+"-"+tabs[0].name,
@@ -576,6 +2255,45 @@ class DashComponent(DashComponentBase):
         All element id's should append +self.name to make sure they are unique."""
         return None
 
+    def render_layout(self, params=None, executor=None):
+        """returns self.layout(params), rendering the layouts of subcomponents
+        concurrently in executor.
+
+        The subcomponents whose layout got called with params during the previous
+        render_layout() call get submitted to executor first (deepest first), and
+        get assembled in order when the layout of their parent asks for them.
+        Subcomponent layouts that have not been started by the time they are needed
+        get rendered in the thread that needs them, so this never deadlocks.
+
+        Args:
+            params (dict): params as passed to .layout(params)
+            executor (concurrent.futures.Executor): e.g. a ThreadPoolExecutor.
+                If None, simply returns self.layout(params).
+        """
+        if executor is None:
+            return self.layout(params)
+
+        DashComponent._enable_render_aware_layouts()
+        render = _LayoutRender(params)
+        render_token = _layout_render.set(render)
+        producing_token = _layout_producing.set(self)
+        try:
+            for comp in reversed(getattr(self, "_layout_plan", ())):
+                if id(comp) not in render.futures:
+                    render.futures[id(comp)] = executor.submit(
+                        contextvars.copy_context().run, _produce_layout, comp, params)
+            layout = self.layout(params)
+        finally:
+            _layout_producing.reset(producing_token)
+            _layout_render.reset(render_token)
+            for future in render.futures.values():
+                future.cancel()
+
+        requested = set(id(comp) for comp in render.requested)
+        if requested != set(id(comp) for comp in getattr(self, "_layout_plan", ())):
+            self._layout_plan = [comp for comp in self._tree_components()[1:] if id(comp) in requested]
+        return layout
+
     def component_callbacks(self, app):
         """register callbacks specific to this ExplainerComponent."""
         if hasattr(self, "_register_callbacks"):
@@ -587,40 +2305,88 @@ class DashComponent(DashComponentBase):
         """First register callbacks of all subcomponents, then call
         _register_callbacks(app)
         """
-        self.register_components()
-        for comp in self._components:
+        for comp in self._registered_components():
             comp.register_callbacks(app)
-        self.component_callbacks(app)
+        profiler = getattr(app, "_dash_oop_profiler", None)
+        component_app = profiler.instrument(app, self) if profiler is not None else app
+        self.component_callbacks(component_app)
+        DashComponentTabs.register_lazy_callbacks(component_app, self)
+
+
+_dash_component_classes.add(DashComponent)
 
 # Cell
 class DashComponentTabs(dcc.Tabs):
 
     def __init__(self, id=None, tabs=None, params=None, value=None,
-                 component=None, single_tab_querystrings=True, **kwargs):
+                 component=None, single_tab_querystrings=True, lazy=False, **kwargs):
         assert id is not None, "Need to pass an id! id cannot be None!"
         assert tabs is not None, "Need to pass a list of tabs!"
         assert all([isinstance(tab, DashComponent) for tab in tabs]), \
             "all items in tabs should be a DashComponent!"
         assert len(set([tab.name for tab in tabs]))==len(tabs), \
             "all tabs should have a unique .name property!"
+        assert not lazy or component is not None, \
+            "Need to pass a component in order to use lazy=True!"
 
-        children = [dcc.Tab(id=id+"-"+tab.name,
-                         value=tab.name,
-                         label=tab.title,
-                         children=tab.layout(params)) for tab in tabs]
         if value is None:
             value = tabs[0].name # default to first tab
         if "value" in kwargs:
             del kwargs["value"]
+
+        # with lazy=True only render the selected tab, except when storing querystring params,
+        # and when DashApp tracks querystrings, as the callbacks that update the url need
+        # all tracked elements to be in the layout:
+        lazy = (lazy and params != "_store_querystring_params"
+                    and not getattr(component, "_track_querystrings", False))
+        if lazy:
+            # the names of the rendered tabs get kept in a store in the selected tab:
+            children = [dcc.Tab(id=id+"-"+tab.name,
+                             value=tab.name,
+                             label=tab.title,
+                             children=[dcc.Store(id=id+"-rendered", data=[tab.name]), tab.layout(params)]
+                                            if tab.name == str(value) else None)
+                                for tab in tabs]
+            if not hasattr(component, "_lazy_tabs"):
+                component._lazy_tabs = {}
+            component._lazy_tabs.setdefault(id, tabs)
+        else:
+            children = [dcc.Tab(id=id+"-"+tab.name,
+                             value=tab.name,
+                             label=tab.title,
+                             children=tab.layout(params))
+                                for tab in tabs]
+
         if component is not None and single_tab_querystrings:
             if not hasattr(component, "_tab_params"):
                 component._tab_params = {}
-
-            component._tab_params[id] = {
-                tab.name: tab.get_querystring_params() for tab in tabs}
+            # only computed once, discover_querystring_params() keeps them up to date:
+            if id not in component._tab_params:
+                component._tab_params[id] = {
+                    tab.name: tab.get_querystring_params() for tab in tabs}
 
         super().__init__(id=id, children=children, value=str(value), **kwargs)
 
+    @staticmethod
+    def register_lazy_callbacks(app, component):
+        """For every DashComponentTabs with lazy=True in the layout of component,
+        register a callback that renders the layout of a tab the first time
+        that it gets selected.
+
+        The names of the tabs that have been rendered get kept in a dcc.Store,
+        so that switching tabs does not send the layouts of the tabs back and forth.
+        When DashApp tracks querystrings all tabs get rendered up front, so
+        these callbacks never need the params in the url."""
+        for id, tabs in getattr(component, "_lazy_tabs", {}).items():
+            def render_lazy_tab(value, rendered, tabs=tabs):
+                if not rendered or value in rendered:
+                    raise PreventUpdate
+                return [tab.layout() if tab.name == value else dash.no_update
+                            for tab in tabs] + [rendered + [value]]
+
+            app.callback([Output(id+"-"+tab.name, "children") for tab in tabs] + [Output(id+"-rendered", "data")],
+                         [Input(id, "value")], [State(id+"-rendered", "data")])(render_lazy_tab)
+
 # Cell
 
 class DashConnector(DashComponent):
@@ -631,8 +2397,6 @@ class DashConnector(DashComponent):
         In the case of a DashConnector this is a dummy, as no subcomponents need to
         be registered.
         """
-        if not hasattr(self, '_components'):
-            self._components = []
 
 # Cell
 
@@ -662,9 +2426,8 @@ def concat_docstring(source=None):
 def parse_url_to_params(url):
     """
     Returns a dict that summarizes the state of the app at the time that the
-    querystring url was generated. Lists are (somewhat hackily) detected
-    by the first char=='['), get evaluated using ast. Numbers are
-    appropriately cast as either int or float.
+    querystring url was generated. Values get decoded with the querystring
+    codec, see decode_querystring().
 
     Params:
         url (str): url to be parsed. The querystring parameters should
@@ -674,93 +2437,32 @@ def parse_url_to_params(url):
         dict: dictionary with the component_id as key and a list
             of (param, value) pairs (e.g. {'input-id': [('value', 1)]}
     """
-
-    parse_result = urlparse(url)
-
-    statedict = parse_qs(parse_result.query)
-    if statedict:
-        for key, values in statedict.items():
-            if len(values) % 2 == 0: # even length means no value attr
-                new_value = list(map(list, zip(values[0::2], values[1::2])))
-                statedict[key] = new_value
-            else: # uneven length means value attr is the first element
-                new_value = list([['value', values[0]]])
-                new_value.extend(list(map(list, zip(values[1::2], values[2::2]))))
-                statedict[key] = new_value
-
-            # go through every parsed value pv and check whether it is a list
-            # or a number and cast appropriately:
-            for pv in statedict[key]:
-                # if it's a list
-                if isinstance(pv[1], str) and pv[1][0]=='[':
-                    pv[1] = ast.literal_eval(pv[1])
-
-                #if it's a number
-                if (isinstance(pv[1], str) and
-                    pv[1].lstrip('-').replace('.','',1).isdigit()):
-
-                    if pv[1].isdigit():
-                        pv[1] = int(pv[1])
-                    else:
-                        pv[1] = float(pv[1])
-    else: #return empty dict
-        statedict = dict()
+    statedict = dict()
+    for (id, attr), value in zip(*decode_querystring(url)):
+        statedict.setdefault(id, []).append([attr, value])
     return statedict
 
 # Cell
 def parse_url_to_qs_and_vals(url):
     """
-    Returns a dict that summarizes the state of the app at the time that the
-    querystring url was generated. Lists are (somewhat hackily) detected
-    by the first char=='['), get evaluated using ast. Numbers are
-    appropriately cast as either int or float.
+    Returns the querystring params and values that summarize the state of the
+    app at the time that the querystring url was generated. Values get decoded
+    with the querystring codec, see decode_querystring().
 
     Params:
         url (str): url to be parsed. The querystring parameters should
             come in pairs e.g.:?input-id=value&binput-id=1
 
     Returns:
-        dict: dictionary with the component_id as key and a list
-            of (param, value) pairs (e.g. {'input-id': [('value', 1)]}
+        tuple(list, list): list of (id, attr) querystring params and list of values
+            e.g. ([('input-id', 'value')], [1])
     """
-
-    parse_result = urlparse(url)
-
-    statedict = parse_qs(parse_result.query)
-    qs_params = []
-    values = []
-
-    if statedict:
-        for key, vals in statedict.items():
-            if len(vals) % 2 == 0: # even length means no value attr
-                qs_params.extend(list(map(tuple, zip([key]*int(0.5*len(vals)), vals[0::2]))))
-                values.extend(vals[1::2])
-            else: # uneven length means value attr is the first element
-                qs_params.append(tuple([key, "value"]))
-                values.append(vals[0])
-
-                qs_params.extend(list(map(tuple, zip([key]*int(0.5*(len(vals)-1)), vals[1::2]))))
-                values.extend(vals[2::2])
-
-    for i in range(len(values)):
-        if isinstance(values[i], str) and values[i][0]=='[':
-            values[i] = ast.literal_eval(values[i])
-
-        #if it's a number
-        if (isinstance(values[i], str) and
-            values[i].lstrip('-').replace('.','',1).isdigit()):
-
-            if values[i].isdigit():
-                values[i] = int(values[i])
-            else:
-                values[i] = float(values[i])
-
-    return qs_params, values
+    return decode_querystring(url)
 
 # Cell
 def encode_querystring_params_to_url(querystring_params, values):
     """encodes a list of querystring_params and a list of values to
-    a url.
+    a url. Values get encoded with the querystring codec, see encode_querystring().
 
     Params:
         querystring_params (list[tuples]): format e.g.
@@ -769,25 +2471,132 @@ def encode_querystring_params_to_url(querystring_params, values):
             [1, 'number']
 
     Returns:
-        str: url of format ?input-id=value&binput-id=1&input-id=type&binput-id='number'
+        str: url of format ?input-id=1&input-id=type&input-id=number
     """
-    statelist = [(id, tuple([val])) if attr=="value" else (id, (attr, val))
-                     for (id, attr), val
-                         in zip(querystring_params, values) if val is not None]
-    params = urlencode(statelist,  doseq=True)
-    return f'?{params}'
+    return encode_querystring(querystring_params, values)
 
 # Cell
 def update_url_with_new_params(old_url, qs_params, vals):
-    old_qs_params, old_vals = parse_url_to_qs_and_vals(old_url)
-    for qs_param, val in zip(qs_params, vals):
-        if qs_param in old_qs_params:
-            old_vals[old_qs_params.index(qs_param)] = val
-        else:
-            old_qs_params.append(qs_param)
-            old_vals.append(val)
-    return encode_querystring_params_to_url(old_qs_params, old_vals)
+    """returns the querystring of old_url with the values of qs_params
+    updated to vals. Only the updated values get (re-)encoded, see UrlState."""
+    return UrlState.from_url(old_url).update(qs_params, vals).querystring()
+
+
+# Cell
+class LayoutTemplate:
+    """A layout that has been rendered and serialized once, together with the paths
+    to all elements that have properties tracked in the querystring.
+
+    .render(params) returns a fresh copy of the serialized layout with the
+    param values patched in, instead of rebuilding all dash components from scratch.
+
+    Only gives the same result as layout(params) when params only affect the layout
+    through the elements wrapped by self.querystring()! Numbers get cast to str
+    when the rendered value is a str (e.g. the value of DashComponentTabs).
+    """
+    def __init__(self, layout, querystring_params):
+        """
+        Args:
+            layout: dash layout, e.g. the output of dashboard_component.layout(None)
+            querystring_params (list): list of (id, attr) tuples of tracked params
+        """
+        self._json = json.dumps(layout, cls=PlotlyJSONEncoder)
+        self.ids = set(id for id, attr in querystring_params)
+        self.paths = {}
+        self._find_paths(json.loads(self._json), ())
+
+    def _find_paths(self, node, path):
+        """stores the path to the props of every element with a tracked id in self.paths"""
+        if isinstance(node, dict):
+            if isinstance(node.get("props"), dict) and "type" in node and "namespace" in node:
+                id = node["props"].get("id")
+                if isinstance(id, str) and id in self.ids:
+                    self.paths.setdefault(id, []).append(path + ("props",))
+                for k, v in node["props"].items():
+                    self._find_paths(v, path + ("props", k))
+        elif isinstance(node, list):
+            for i, v in enumerate(node):
+                self._find_paths(v, path + (i,))
+
+    def render(self, params=None):
+        """returns a copy of the serialized layout with params patched in.
+
+        Args:
+            params (dict): dict of id to list of (attr, value) pairs as returned by
+                parse_url_to_params()
+        """
+        tree = json.loads(self._json)
+        for id, param_values in (params or {}).items():
+            for path in self.paths.get(id, []):
+                props = tree
+                for key in path:
+                    props = props[key]
+                for attr, val in param_values:
+                    if isinstance(props.get(attr), str) and isinstance(val, (int, float)):
+                        val = str(val)
+                    props[attr] = val
+        return tree
 
+# Cell
+class QuerystringRegistry:
+    """Frozen registry of all querystring parameters of a DashComponent tree.
+
+    Gets computed once when the DashApp is built, so that the url callbacks
+    do not have to walk the component tree on every call.
+
+    Attributes:
+        params (tuple): tuple of (id, attr) tuples of all tracked parameters
+        index (dict): dict mapping each (id, attr) to its position in params
+        has_tab_params (bool): whether the dashboard_component has _tab_params,
+            in which case only the parameters of the current tabs get stored
+        tab_exclusions (tuple): for every tracked DashComponentTabs a tuple of
+            (position of the tabs value, {tab_name: frozenset(excluded positions)},
+            frozenset(positions of all tabs))
+    """
+    def __init__(self, dashboard_component):
+        """
+        Args:
+            dashboard_component (DashComponent): component of which the querystring
+                params have been computed with .compute_querystring_params()
+        """
+        self.params = tuple(tuple(param) for param in dashboard_component.get_querystring_params())
+        self.index = {}
+        for pos, param in enumerate(self.params):
+            self.index.setdefault(param, pos)
+
+        self.has_tab_params = hasattr(dashboard_component, "_tab_params")
+        tab_exclusions = []
+        if self.has_tab_params:
+            for tabs_id, tabs in dashboard_component._tab_params.items():
+                if (tabs_id, "value") not in self.index:
+                    continue
+                tab_positions = {tab_name: self._positions(tab_qs) for tab_name, tab_qs in tabs.items()}
+                all_positions = frozenset().union(*tab_positions.values())
+                excluded = {tab_name: frozenset().union(*[positions for other_name, positions
+                                                          in tab_positions.items() if other_name != tab_name])
+                            for tab_name in tab_positions}
+                tab_exclusions.append((self.index[(tabs_id, "value")], excluded, all_positions))
+        self.tab_exclusions = tuple(tab_exclusions)
+
+    def _positions(self, params):
+        """returns frozenset of all positions in self.params of the (id, attr) tuples in params"""
+        params = set(tuple(param) for param in params)
+        return frozenset(pos for pos, param in enumerate(self.params) if param in params)
+
+    def __len__(self):
+        return len(self.params)
+
+    def excluded_positions(self, values):
+        """returns set of positions that should not be stored in the querystring
+        because they are not on the currently selected tab.
+
+        Args:
+            values (list): current values of all params, in the same order as .params
+        """
+        excluded = set()
+        for value_pos, tab_excluded, all_positions in self.tab_exclusions:
+            excluded.update(tab_excluded.get(values[value_pos], all_positions))
+        return excluded
 
 # Cell
 
@@ -798,30 +2607,75 @@ class DashApp(DashComponentBase):
     Can run both Dash and JupyterDash apps.
 
     """
+    # the config of the dashboard_component gets built when the config of the DashApp is
+    _config_param_types = (DashComponent,)
+
     @concat_docstring(dash.Dash)
     def __init__(self, dashboard_component,
                  port=8050, mode='dash', querystrings=False, bootstrap=False,
-                 **kwargs):
+                 cache_backend=None, cache_layout=False, layout_threads=None,
+                 profile_callbacks=False, metrics_endpoint=False, **kwargs):
         """
 
         Args:
             dashboard_component (DashComponent): component to be run
             port (int): port to run the server
             mode ({'dash', 'external', 'inline', 'jupyterlab'}): type of dash server to start
-            querystrings (bool): save state to querystring and load from querystring
+            querystrings (bool, str): save state to querystring and load from querystring.
+                With querystrings='clientside' the querystring gets updated in the
+                browser by a generated clientside callback, instead of by a server callback.
             bootstrap: include default bootstrap css
+            cache_backend (str, dict): backend for @figure_cache decorated
+                DashFigureFactory methods: None or 'memory' (per process), 'disk'
+                or 'shared_memory' (shared between worker processes), or a dict
+                with parameters e.g. dict(backend='disk', path='figure_cache.sqlite').
+                See set_figure_cache_backend()
+            cache_layout (bool): with querystrings=True, render the layout only once,
+                and for every page load only patch in the values from the querystring
+                (see LayoutTemplate). Only use when params only affect the layout
+                through elements wrapped by self.querystring()
+            layout_threads (int): with querystrings=True, render the layouts of
+                subcomponents concurrently in a thread pool with this many threads
+                on every page load (see DashComponent.render_layout()). Speeds up
+                layouts with many figures, as pandas and plotly often release the GIL.
+                Defaults to None (render sequentially).
+            profile_callbacks (bool): record the calls, wall time, DashFigureFactory
+                time and response size of every callback, labeled with the class and
+                name of the component that registered it. See .callback_stats()
+            metrics_endpoint (bool): serve the callback statistics in prometheus text
+                format at /_dash_oop/metrics (implies profile_callbacks=True).
+                Statistics are per process, so with multiple workers every scrape
+                only sees the worker that answers it.
             kwargs: all kwargs will be passed down to dash.Dash. See below the docstring of dash.Dash
 
         Returns:
             DashApp: simply start .run() to start the dashboard
         """
         super().__init__(child_depth=2)
-        self._stored_params['dashboard_component'] = dashboard_component.to_config()
+        self._executor, self._executor_pid = None, None
         self.app = self._get_dash_app()
 
+    def _layout_executor(self):
+        """returns the thread pool for rendering layouts of this process, or None"""
+        if not self.layout_threads:
+            return None
+        # threads do not survive a fork, so every (gunicorn) worker needs its own pool:
+        if self._executor_pid != os.getpid():
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(self.layout_threads, thread_name_prefix="dash_oop_layout")
+            self._executor_pid = os.getpid()
+        return self._executor
+
     def _get_dash_app(self):
+        if self.cache_backend is not None:
+            set_figure_cache_backend(self.cache_backend)
+
         if self.bootstrap:
-            bootstrap_theme = self.bootstrap if isinstance(self.bootstrap, str) else dbc.themes.BOOTSTRAP
+            if isinstance(self.bootstrap, str):
+                bootstrap_theme = self.bootstrap
+            else:
+                import dash_bootstrap_components as dbc
+                bootstrap_theme = dbc.themes.BOOTSTRAP
             if 'external_stylesheets' not in self.kwargs:
                 self.kwargs['external_stylesheets'] = [bootstrap_theme]
             else:
@@ -832,22 +2686,37 @@ class DashApp(DashComponentBase):
         if self.mode == 'dash':
             app = dash.Dash(**self.kwargs)
         elif self.mode in {'inline', 'external', 'jupyterlab'}:
+            import jupyter_dash
             app = jupyter_dash.JupyterDash(**self.kwargs)
 
+        self.profiler = None
+        callback_app = app
+        if self.profile_callbacks or self.metrics_endpoint:
+            self.profiler = CallbackProfiler()
+            self.profiler.register_payload_hook(app.server)
+            app._dash_oop_profiler = self.profiler
+            callback_app = self.profiler.instrument(app, self)
+            if self.metrics_endpoint:
+                app.server.add_url_rule("/_dash_oop/metrics", "dash_oop_metrics",
+                    lambda: flask.Response(self.profiler.to_prometheus(),
+                                           mimetype="text/plain; version=0.0.4"))
+
         if not self.querystrings:
             app.layout = self.dashboard_component.layout()
 
         else:
+            # DashComponentTabs(lazy=True) render all tabs, so that all tracked elements are in the layout:
+            for comp in self.dashboard_component._tree_components():
+                comp._track_querystrings = True
 
             try:
-                self.dashboard_component.compute_querystring_params()
-                self.dashboard_component.layout(None)
+                unreachable_params = self.dashboard_component.discover_querystring_params(
+                    raise_errors=True)
             except Exception as e:
                 print(e)
                 raise ValueError("The layout method method of dashboard_component does not take "
                                  "a params parameter. Please rewrite as `def layout(self, params=None):` !")
 
-            unreachable_params = self.dashboard_component.get_unreachable_querystring_params()
             if unreachable_params:
                 print("Warning: The following elements will be tracked in the querystring, "
                       "but do not get passed as params to the (subcomponent) .layout(params) function, and so "
@@ -855,49 +2724,94 @@ class DashApp(DashComponentBase):
                       "make sure that you pass params down to the layout of all subcomponents! "
                       "e.g. def layout(self, params=None): return html.Div([self.sub_component.layout(params)]) \n\n",
                       unreachable_params)
+            self.querystring_registry = QuerystringRegistry(self.dashboard_component)
+            registry = self.querystring_registry
+            if self.cache_layout:
+                self.layout_template = LayoutTemplate(
+                    self.dashboard_component.layout(None), registry.params)
+
             app.layout = html.Div([
                         dcc.Location(id='url', refresh=False),
+                        dcc.Store(id='page-state'),
+                        dcc.Store(id='url-delta'),
                         html.Div(id='page-layout')
                     ])
 
-            @app.callback(Output('page-layout', 'children'),
-                  [Input('url', 'href')])
-            def page_load(href):
+            @callback_app.callback([Output('page-layout', 'children'),
+                           Output('page-state', 'data')],
+                  [Input('url', 'href')],
+                  [State('page-state', 'data')])
+            def page_load(href, last_href):
+                """Renders the full layout on the first load. After that, when only tracked
+                values changed (e.g. because update_url_state updated the url, or the user
+                navigated back), only the changed element properties get updated."""
                 if not href:
-                    return html.Div()
-                params = parse_url_to_params(href)
-                return self.dashboard_component.layout(params)
-
-            @app.callback(Output('url', 'search'),
-                          [Input(id, param) for (id, param)
-                                  in self.dashboard_component.get_querystring_params()],
-                         [State('url', 'search')],
-                         prevent_initial_call=True
-                 )
-            def update_url_state(*values):
-                if hasattr(self.dashboard_component, "_tab_params"):
-                    tab_params = self.dashboard_component._tab_params
-                    qs_params = self.dashboard_component.get_querystring_params()
-                    qs_keys, qs_attrs = zip(*qs_params)
-
-                    excluded_params = []
-                    for tab in set(qs_keys) & set(tab_params.keys()):
-                        tab_value = values[qs_params.index(tuple([tab, "value"]))]
-                        for tab_name, tab_qs  in tab_params[tab].items():
-                            if tab_name != tab_value:
-                                excluded_params.extend(tab_qs)
-
-                    qs_vals = [(qs, v) for qs, v in zip(qs_params, values) if qs not in excluded_params]
+                    return html.Div(), None
+                try:
+                    if last_href is not None and hasattr(dash, "set_props"):
+                        old_state, new_state = UrlState.from_url(last_href), UrlState.from_url(href)
+                        changed = new_state.changed_since(old_state)
+                        if (old_state.keys() <= new_state.keys()
+                                and all(param in registry.index for param in changed)):
+                            props = {}
+                            for id, attr in changed:
+                                props.setdefault(id, {})[attr] = new_state[(id, attr)]
+                            for id, id_props in props.items():
+                                dash.set_props(id, id_props)
+                            return dash.no_update, href
+
+                    params = parse_url_to_params(href)
+                except ValueError as e:
+                    # e.g. a querystring longer than MAX_QUERYSTRING_LENGTH: keep the current
+                    # layout, or render the default layout on the first load.
+                    print(f"Warning: ignoring the url querystring: {e}")
+                    if last_href is not None:
+                        return dash.no_update, dash.no_update
+                    params, href = None, None
+                if self.cache_layout:
+                    return self.layout_template.render(params), href
+                return self.dashboard_component.render_layout(params, self._layout_executor()), href
+
+            if self.querystrings == "clientside":
+                app.clientside_callback(
+                    clientside_querystring_js(registry.params, registry.tab_exclusions),
+                    Output('url', 'search'),
+                    [Input(id, param) for (id, param) in registry.params],
+                    [State('url', 'search')],
+                    prevent_initial_call=True)
+            elif registry.has_tab_params:
+                @callback_app.callback(Output('url', 'search'),
+                              [Input(id, param) for (id, param) in registry.params],
+                             prevent_initial_call=True
+                     )
+                def update_url_state(*values):
+                    excluded = registry.excluded_positions(values)
+                    qs_vals = [(qs, v) for pos, (qs, v) in enumerate(zip(registry.params, values))
+                                    if pos not in excluded]
                     q, v = zip(*qs_vals)
-                    return encode_querystring_params_to_url(q, v)
-
-                old_url = values[-1]
-                ctx = dash.callback_context
-                params = [tuple(trigger['prop_id'].split('.')) for trigger in ctx.triggered]
-                idxs = [self.dashboard_component.get_querystring_params().index(param)
-                            for param in params]
-                vals = list(map(values.__getitem__, idxs))
-                return update_url_with_new_params(old_url, params, vals)
+                    try:
+                        return encode_querystring_params_to_url(q, v)
+                    except ValueError as e:
+                        print(f"Warning: not updating the url querystring: {e}")
+                        return dash.no_update
+            else:
+                @callback_app.callback(Output('url-delta', 'data'),
+                              [Input(id, param) for (id, param) in registry.params],
+                             prevent_initial_call=True
+                     )
+                def update_url_state(*values):
+                    """only encodes the changed params, which then get merged into
+                    url.search in the browser, so the current url is not needed."""
+                    ctx = dash.callback_context
+                    params = [tuple(trigger['prop_id'].split('.')) for trigger in ctx.triggered]
+                    vals = [values[registry.index[param]] for param in params]
+                    return encode_querystring_delta(params, vals)
+
+                app.clientside_callback(MERGE_QUERYSTRING_JS,
+                                        Output('url', 'search'),
+                                        [Input('url-delta', 'data')],
+                                        [State('url', 'search')],
+                                        prevent_initial_call=True)
 
 
         self.dashboard_component.register_callbacks(app)
@@ -915,9 +2829,21 @@ class DashApp(DashComponentBase):
         """returns flask server inside self.app, for building wsgi apps"""
         return self.app.server
 
+    def callback_stats(self):
+        """returns a list with for every callback a dict with the component class,
+        component name and callback name, and the number of calls and errors,
+        the total, mean and max wall time, the time spent in DashFigureFactory
+        methods and the total response size in bytes. Slowest callbacks first.
+
+        Requires DashApp(..., profile_callbacks=True).
+        """
+        if self.profiler is None:
+            raise ValueError("Callbacks are not being profiled! Pass profile_callbacks=True to DashApp.")
+        return self.profiler.stats()
+
     def run(
-        self, 
-        port=None, 
+        self,
+        port=None,
         host='127.0.0.1',
         proxy=None,
         debug=None,
@@ -947,5 +2873,5 @@ class DashApp(DashComponentBase):
             dev_tools_hot_reload_max_retry=dev_tools_hot_reload_max_retry,
             dev_tools_silence_routes_logging=dev_tools_silence_routes_logging,
             dev_tools_prune_errors=dev_tools_prune_errors,
-            **flask_run_options   
-        )
+            **flask_run_options
+        )
\ No newline at end of file
@@ -0,0 +1,556 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 05_querystring_codec.ipynb (unless otherwise specified).
+
+__all__ = ['MAX_QUERYSTRING_LENGTH', 'MAX_LIST_DEPTH', 'encode_value', 'decode_value', 'encode_querystring',
+           'decode_querystring', 'clear_querystring_cache', 'UrlState', 'encode_querystring_delta',
+           'clientside_querystring_js', 'MERGE_QUERYSTRING_JS']
+
+# Cell
+
+import re
+import json
+import math
+import numbers
+import functools
+from collections.abc import Mapping
+from urllib.parse import urlparse, quote, unquote_plus
+
+# Cell
+
+MAX_QUERYSTRING_LENGTH = 16384
+MAX_LIST_DEPTH = 32
+
+_SAFE_CHARS = "[],~"
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\Z")
+_INT = re.compile(r"-?\d+\Z")
+_CONSTANTS = {"True": True, "False": False, "None": None,
+              "nan": math.nan, "inf": math.inf, "-inf": -math.inf}
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "b": "\b", "f": "\f"}
+_QUOTE_CHARS = set("[],\"'\\")
+
+# Cell
+
+def _decode_scalar(word):
+    """decodes a single (unquoted) word to a number, bool, None or str"""
+    if word in _CONSTANTS:
+        return _CONSTANTS[word]
+    if _NUMBER.match(word):
+        return int(word) if _INT.match(word) else float(word)
+    return word
+
+
+def _format_float(value):
+    """formats a float the same way as javascript's String(number), so that values
+    that get encoded in the browser (see clientside_querystring_js()) and on the server
+    result in the same querystring. Javascript does not tell ints and floats apart,
+    so integral floats get written without decimals (e.g. 1.0 as "1") and get
+    decoded as ints."""
+    if math.isnan(value):
+        return "nan"
+    if math.isinf(value):
+        return "inf" if value > 0 else "-inf"
+    if value == 0:
+        return "0"
+    # python and javascript both use the shortest digits that round-trip, so take them
+    # from repr(), with value == 0.digits * 10**n:
+    mantissa, _, exponent = repr(abs(value)).partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    digits = (whole + fraction).lstrip("0")
+    n = len(whole) - (len(whole + fraction) - len(digits)) + int(exponent or 0)
+    digits = digits.rstrip("0")
+    sign = "-" if value < 0 else ""
+    if len(digits) <= n <= 21:
+        return sign + digits + "0" * (n - len(digits))
+    if 0 < n <= 21:
+        return sign + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + digits
+    return (sign + digits[0] + ("." + digits[1:] if len(digits) > 1 else "")
+                + ("e+" if n > 0 else "e-") + str(abs(n - 1)))
+
+
+def _json_stringify(value):
+    """formats value the same way as javascript's JSON.stringify(value), with
+    numbers written as by _format_float()"""
+    if value is None or isinstance(value, bool):
+        return json.dumps(value)
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):
+        return _format_float(float(value)) if math.isfinite(value) else "null"
+    if isinstance(value, Mapping):
+        return "{" + ",".join(json.dumps(str(key), ensure_ascii=False) + ":" + _json_stringify(item)
+                                  for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_json_stringify(item) for item in value) + "]"
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _encode_item(item):
+    """encodes an element of a list"""
+    if isinstance(item, str):
+        if (not item or item != item.strip() or not _QUOTE_CHARS.isdisjoint(item)
+                or _decode_scalar(item) is not item):
+            return json.dumps(item, ensure_ascii=False)
+        return item
+    return encode_value(item)
+
+
+def encode_value(value):
+    """encodes a single querystring value to a str that gets decoded back to
+    the same value by decode_value()
+
+    Args:
+        value: str, int, float, bool, None or (nested) list of these.
+            dicts get encoded as JSON, the same way as JSON.stringify() does in
+            the browser, and get decoded as a str. Other types (that dash can not
+            send to the browser as JSON) get encoded as str(value)
+
+    Returns:
+        str
+    """
+    if value is None or isinstance(value, bool):
+        return str(value)
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):
+        return _format_float(float(value))
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_encode_item(item) for item in value) + "]"
+    if isinstance(value, Mapping):
+        value = _json_stringify(value)
+    elif not isinstance(value, str):
+        value = str(value)
+    if value[:1] in ("", "~", "[") or _decode_scalar(value) is not value:
+        return "~" + value
+    return value
+
+# Cell
+
+def _decode_quoted(s, pos):
+    """decodes the quoted string that starts at s[pos], returns (str, position after)"""
+    quote_char, pos, chars = s[pos], pos + 1, []
+    while True:
+        end = s.find(quote_char, pos)
+        backslash = s.find("\\", pos, None if end == -1 else end)
+        if backslash == -1:
+            if end == -1:
+                raise ValueError(f"Unterminated string in {s!r}")
+            chars.append(s[pos:end])
+            return "".join(chars), end + 1
+        chars.append(s[pos:backslash])
+        code = s[backslash + 1:backslash + 2]
+        if code in ("u", "x"):
+            n = 4 if code == "u" else 2
+            try:
+                chars.append(chr(int(s[backslash + 2:backslash + 2 + n], 16)))
+            except ValueError:
+                raise ValueError(f"Invalid escape in {s!r}")
+            pos = backslash + 2 + n
+        else:
+            chars.append(_ESCAPES.get(code, code))
+            pos = backslash + 2
+
+
+def _decode_list(s, max_depth=MAX_LIST_DEPTH):
+    """decodes a (nested) list in a single pass over s"""
+    stack, pos, n = [], 0, len(s)
+    while pos < n:
+        c = s[pos]
+        if c == "[":
+            if len(stack) >= max_depth:
+                raise ValueError(f"Lists nested deeper than {max_depth} levels!")
+            new = []
+            if stack:
+                stack[-1].append(new)
+            stack.append(new)
+            pos += 1
+        elif c == "]":
+            if not stack:
+                raise ValueError(f"Unbalanced brackets in {s!r}")
+            result = stack.pop()
+            pos += 1
+            if not stack:
+                if s[pos:].strip():
+                    raise ValueError(f"Trailing characters in {s!r}")
+                return result
+        elif c == "," or c.isspace():
+            pos += 1
+        elif not stack:
+            raise ValueError(f"{s!r} is not a list")
+        elif c in "\"'":
+            item, pos = _decode_quoted(s, pos)
+            stack[-1].append(item)
+        else:
+            end = pos
+            while end < n and s[end] not in "[],":
+                end += 1
+            stack[-1].append(_decode_scalar(s[pos:end].strip()))
+            pos = end
+    raise ValueError(f"Unbalanced brackets in {s!r}")
+
+
+def decode_value(s):
+    """decodes a single querystring value that was encoded with encode_value().
+
+    Strings that start with '[' but are not a valid list get returned as is.
+
+    Args:
+        s (str): encoded value
+
+    Returns:
+        decoded value
+    """
+    if s[:1] == "~":
+        return s[1:]
+    if s[:1] == "[":
+        try:
+            return _decode_list(s)
+        except ValueError as e:
+            if "nested deeper" in str(e):
+                raise
+            return s
+    return _decode_scalar(s)
+
+# Cell
+
+def _encode_segment(value):
+    """encodes value to a percent-encoded querystring segment"""
+    return quote(encode_value(value), safe=_SAFE_CHARS)
+
+
+def _join_segments(segments, max_length=MAX_QUERYSTRING_LENGTH):
+    """joins ((id, attr), segment) pairs to a querystring, with the value
+    attribute of every id first"""
+    entries = {}
+    for (id, attr), segment in segments:
+        if attr == "value":
+            entries.setdefault(id, []).insert(0, segment)
+        else:
+            entries.setdefault(id, []).extend([quote(attr, safe=_SAFE_CHARS), segment])
+    querystring = "?" + "&".join(
+        quote(id, safe="") + "=" + entry for id, id_entries in entries.items() for entry in id_entries)
+    if len(querystring) > max_length:
+        raise ValueError(f"Encoded querystring is longer than {max_length} characters!")
+    return querystring
+
+
+def _query(url, max_length=MAX_QUERYSTRING_LENGTH):
+    """returns the (length checked) querystring part of url"""
+    query = urlparse(url).query if url else ""
+    if len(query) > max_length:
+        raise ValueError(f"Querystring is longer than {max_length} characters!")
+    return query
+
+
+@functools.lru_cache(maxsize=256)
+def _split_query(query):
+    """splits query into a tuple of ((id, attr), segment) pairs without decoding the values"""
+    statedict = {}
+    for field in query.split("&"):
+        if field:
+            key, _, segment = field.partition("=")
+            statedict.setdefault(unquote_plus(key), []).append(segment)
+
+    segments = []
+    for key, segs in statedict.items():
+        if len(segs) % 2 == 1: # uneven length means value attr is the first element
+            segments.append(((key, "value"), segs[0]))
+            segs = segs[1:]
+        segments.extend(((key, unquote_plus(attr)), segment)
+                            for attr, segment in zip(segs[0::2], segs[1::2]))
+    return tuple(segments)
+
+
+def _freeze(value):
+    return tuple(_freeze(v) for v in value) if isinstance(value, list) else value
+
+
+def _thaw(value):
+    return [_thaw(v) for v in value] if isinstance(value, tuple) else value
+
+
+@functools.lru_cache(maxsize=256)
+def _decode_query(query):
+    """decodes query and returns (tuple of (id, attr), tuple of frozen values)"""
+    segments = _split_query(query)
+    return (tuple(param for param, _ in segments),
+            tuple(_freeze(decode_value(unquote_plus(segment))) for _, segment in segments))
+
+
+def encode_querystring(querystring_params, values, max_length=MAX_QUERYSTRING_LENGTH):
+    """encodes a list of querystring_params and a list of values to
+    a querystring.
+
+    Args:
+        querystring_params (list[tuples]): format e.g.
+            [('input-id', 'value'), ('input-id', 'type')]
+        values (list): list of values to be encoded, e.g.
+            [1, 'number']
+        max_length (int): raise a ValueError if the querystring would
+            be longer than max_length characters
+
+    Returns:
+        str: querystring of format ?input-id=1&input-id=type&input-id=number
+    """
+    segments = {tuple(param): _encode_segment(value)
+                    for param, value in zip(querystring_params, values) if value is not None}
+    return _join_segments(segments.items(), max_length)
+
+
+def decode_querystring(url, max_length=MAX_QUERYSTRING_LENGTH):
+    """decodes the querystring of a url that was encoded with encode_querystring().
+
+    Recently decoded querystrings get cached.
+
+    Args:
+        url (str): url or querystring, e.g. http://localhost:8050/?input-id=1
+        max_length (int): raise a ValueError if the querystring is longer than
+            max_length characters
+
+    Returns:
+        tuple(list, list): list of (id, attr) querystring_params and list of values
+    """
+    querystring_params, values = _decode_query(_query(url, max_length))
+    return list(querystring_params), [_thaw(value) for value in values]
+
+
+def clear_querystring_cache():
+    """clears the cache of decoded querystrings"""
+    _split_query.cache_clear()
+    _decode_query.cache_clear()
+
+# Cell
+
+class UrlState(Mapping):
+    """Ordered mapping of (id, attr) querystring params to the encoded
+    querystring segments of their values, that can be updated incrementally:
+
+        state = UrlState.from_url(old_url)
+        new_url = state.update([('input-id', 'value')], [2]).querystring()
+    """
+    def __init__(self, querystring_params=(), values=()):
+        """
+        Args:
+            querystring_params (list[tuples]): list of (id, attr) params
+            values (list): list of values of the params
+        """
+        self._segments = {}
+        self.update(querystring_params, values)
+
+    @classmethod
+    def from_url(cls, url, max_length=MAX_QUERYSTRING_LENGTH):
+        """parses the querystring of url into a UrlState without decoding any values"""
+        state = cls()
+        state._segments = dict(_split_query(_query(url, max_length)))
+        return state
+
+    def update(self, querystring_params, values):
+        """apply a delta: only the values of querystring_params get encoded.
+        Params with value None get removed. Returns self."""
+        for param, value in zip(querystring_params, values):
+            param = tuple(param)
+            if value is None:
+                self._segments.pop(param, None)
+            else:
+                self._segments[param] = _encode_segment(value)
+        return self
+
+    def changed_since(self, other):
+        """returns the list of params of which the value is new or different from other"""
+        return [param for param, segment in self._segments.items()
+                    if other._segments.get(param) != segment]
+
+    def querystring(self, max_length=MAX_QUERYSTRING_LENGTH):
+        """returns the querystring, e.g. ?input-id=1"""
+        return _join_segments(self._segments.items(), max_length)
+
+    def __getitem__(self, param):
+        return decode_value(unquote_plus(self._segments[tuple(param)]))
+
+    def __iter__(self):
+        return iter(self._segments)
+
+    def __len__(self):
+        return len(self._segments)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.querystring()!r})"
+
+# Cell
+
+def encode_querystring_delta(querystring_params, values):
+    """encodes the changed querystring_params and values to a list of
+    [id, attr, segment] that can be merged into the url in the browser with
+    MERGE_QUERYSTRING_JS. Params with value None get a segment of None, which
+    removes them from the url."""
+    return [[id, attr, None if value is None else _encode_segment(value)]
+                for (id, attr), value in zip(querystring_params, values)]
+
+
+_ENCODE_SEGMENT_JS = r"""
+    function quote(s, safe) {
+        return encodeURIComponent(s).replace(/[!'()*]/g, function(c) {
+            return '%' + c.charCodeAt(0).toString(16).toUpperCase();
+        }).replace(/%5B|%5D|%2C/g, function(c) {
+            return safe ? decodeURIComponent(c) : c;
+        });
+    }
+    function isScalar(s) {
+        return ['True', 'False', 'None', 'nan', 'inf', '-inf'].indexOf(s) >= 0 ||
+            /^-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$/.test(s);
+    }
+    function encodeValue(value) {
+        if (value === null || value === undefined) {
+            return 'None';
+        }
+        if (typeof value === 'boolean') {
+            return value ? 'True' : 'False';
+        }
+        if (typeof value === 'number') {
+            return isNaN(value) ? 'nan' : value === Infinity ? 'inf' : value === -Infinity ? '-inf' : String(value);
+        }
+        if (Array.isArray(value)) {
+            return '[' + value.map(function(item) {
+                if (typeof item === 'string' && (!item || item !== item.trim() ||
+                        /[\[\],"'\\]/.test(item) || isScalar(item))) {
+                    return JSON.stringify(item);
+                }
+                return encodeValue(item);
+            }).join(',') + ']';
+        }
+        value = typeof value === 'string' ? value : JSON.stringify(value);
+        if (!value || value[0] === '~' || value[0] === '[' || isScalar(value)) {
+            return '~' + value;
+        }
+        return value;
+    }
+    function encodeSegment(value) {
+        return (value === null || value === undefined) ? null : quote(encodeValue(value), true);
+    }
+"""
+
+_MERGE_QUERYSTRING_FUNCTION_JS = r"""
+    function mergeQuerystring(search, delta) {
+        var decode = function(s) { return decodeURIComponent(s.replace(/\+/g, ' ')); };
+        var ids = [], groups = Object.create(null), fields = Object.create(null);
+        var group = function(id) {
+            if (!(id in groups)) {
+                groups[id] = {attrs: [], segments: Object.create(null)};
+                ids.push(id);
+            }
+            return groups[id];
+        };
+        var set = function(g, attr, segment) {
+            if (!(attr in g.segments)) {
+                g.attrs.push(attr);
+            }
+            g.segments[attr] = segment;
+        };
+        (search || '').replace(/^\?/, '').split('&').forEach(function(field) {
+            if (!field) {
+                return;
+            }
+            var pos = field.indexOf('=');
+            var key = decode(pos < 0 ? field : field.slice(0, pos));
+            if (!(key in fields)) {
+                fields[key] = [];
+                group(key);
+            }
+            fields[key].push(pos < 0 ? '' : field.slice(pos + 1));
+        });
+        ids.forEach(function(key) {
+            var segments = fields[key], g = groups[key];
+            if (segments.length % 2 == 1) {
+                set(g, 'value', segments.shift());
+            }
+            for (var i = 0; i + 1 < segments.length; i += 2) {
+                set(g, decode(segments[i]), segments[i + 1]);
+            }
+        });
+        delta.forEach(function(d) {
+            set(group(d[0]), d[1], d[2]);
+        });
+        var entries = [];
+        ids.forEach(function(id) {
+            var g = groups[id], key = quote(id, false);
+            if (g.segments['value'] != null) {
+                entries.push(key + '=' + g.segments['value']);
+            }
+            g.attrs.forEach(function(attr) {
+                if (attr != 'value' && g.segments[attr] != null) {
+                    entries.push(key + '=' + quote(attr, true), key + '=' + g.segments[attr]);
+                }
+            });
+        });
+        return '?' + entries.join('&');
+    }
+"""
+
+MERGE_QUERYSTRING_JS = ("function(delta, search) {" + _ENCODE_SEGMENT_JS + _MERGE_QUERYSTRING_FUNCTION_JS + """
+    if (!delta) {
+        return window.dash_clientside.no_update;
+    }
+    return mergeQuerystring(search, delta);
+}""")
+
+
+def clientside_querystring_js(querystring_params, tab_exclusions=()):
+    """returns the javascript function for a dash clientside_callback that keeps
+    url.search in sync with the values of querystring_params, so that the
+    querystring gets encoded in the browser without a round-trip to the server.
+
+    The callback should have an Input for every param in querystring_params
+    (in the same order), and State('url', 'search') as the last argument.
+
+    Args:
+        querystring_params (list[tuples]): list of (id, attr) params
+        tab_exclusions (tuple): see QuerystringRegistry.tab_exclusions. If
+            given, only the params of the selected tabs get stored, and the whole
+            querystring gets rebuilt on every change. Otherwise only the
+            triggered values get merged into the current querystring.
+
+    Returns:
+        str: javascript function
+    """
+    params = json.dumps([list(param) for param in querystring_params])
+    tabs = json.dumps([[value_pos, {tab: sorted(positions) for tab, positions in excluded.items()},
+                            sorted(all_positions)]
+                                for value_pos, excluded, all_positions in tab_exclusions])
+    return ("function() {" + _ENCODE_SEGMENT_JS + _MERGE_QUERYSTRING_FUNCTION_JS + """
+    var params = """ + params + """;
+    var tabExclusions = """ + tabs + """;
+    var values = Array.prototype.slice.call(arguments, 0, params.length);
+    var search = arguments[params.length];
+    var delta = [];
+    if (tabExclusions.length) {
+        var excluded = Object.create(null);
+        tabExclusions.forEach(function(tabs) {
+            var tab = values[tabs[0]];
+            var positions = Object.prototype.hasOwnProperty.call(tabs[1], tab) ? tabs[1][tab] : tabs[2];
+            positions.forEach(function(pos) { excluded[pos] = true; });
+        });
+        params.forEach(function(param, pos) {
+            if (!excluded[pos]) {
+                delta.push([param[0], param[1], encodeSegment(values[pos])]);
+            }
+        });
+        return mergeQuerystring('', delta);
+    }
+    var index = Object.create(null);
+    params.forEach(function(param, pos) {
+        var key = param[0] + '.' + param[1];
+        if (!(key in index)) {
+            index[key] = pos;
+        }
+    });
+    (window.dash_clientside.callback_context.triggered || []).forEach(function(trigger) {
+        if (trigger.prop_id in index) {
+            var pos = index[trigger.prop_id];
+            delta.push([params[pos][0], params[pos][1], encodeSegment(values[pos])]);
+        }
+    });
+    if (!delta.length) {
+        return window.dash_clientside.no_update;
+    }
+    return mergeQuerystring(search, delta);
+}""")
\ No newline at end of file
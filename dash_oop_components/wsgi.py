@@ -0,0 +1,182 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 06_wsgi.ipynb (unless otherwise specified).
+
+__all__ = ['register_post_fork_hook', 'run_post_fork_hooks', 'load_dashboard', 'warmup_dashboard', 'reinit_after_fork',
+           'create_app']
+
+# Cell
+from .core import *
+
+# Cell
+
+import os
+import gc
+import time
+import functools
+from pathlib import Path
+
+# Cell
+
+_post_fork_hooks = []
+_post_fork_pid = None
+
+def register_post_fork_hook(func):
+    """Registers func to be called without arguments in every process
+    that gets forked from this one (e.g. every gunicorn worker).
+
+    Can be used as a decorator. Hooks run in order of registration.
+    """
+    if not _post_fork_hooks and hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=run_post_fork_hooks)
+    _post_fork_hooks.append(func)
+    return func
+
+
+def run_post_fork_hooks(*args):
+    """Runs all hooks registered with register_post_fork_hook().
+
+    Gets called automatically after every os.fork(), but can also be set as
+    gunicorn server hook in gunicorn.conf.py (`post_fork = run_post_fork_hooks`).
+    Hooks only run once per process.
+    """
+    global _post_fork_pid
+    if _post_fork_pid == os.getpid():
+        return
+    _post_fork_pid = os.getpid()
+    for hook in _post_fork_hooks:
+        hook()
+
+# Cell
+
+def load_dashboard(dashboard_yaml="dashboard.yaml", try_pickles=False, force_pickles=False,
+                   mmap_mode=None, cache_plan=True, **dashapp_kwargs):
+    """Loads a DashApp from a yaml file. If the yaml stores a DashComponent
+    instead, it gets wrapped in a DashApp(dashboard_component, **dashapp_kwargs).
+
+    Args:
+        dashboard_yaml (str, Path): .yaml file generated with .to_yaml().
+            Defaults to 'dashboard.yaml'
+        try_pickles (bool): try to load DashFigureFactories from their filepath
+        force_pickles (bool): load DashFigureFactories from their filepath or raise
+        mmap_mode (str): memory-map the arrays and DataFrames of factories
+            that get loaded from file, see DashComponentBase.from_file()
+        cache_plan (bool): reuse the compiled ConfigPlan stored beside dashboard_yaml,
+            so that the yaml only gets parsed again after it changes. Defaults to True.
+        dashapp_kwargs: parameters for DashApp when dashboard_yaml stores a DashComponent,
+            e.g. querystrings=True
+
+    Returns:
+        DashApp
+    """
+    dashboard_yaml = Path(dashboard_yaml)
+    if not dashboard_yaml.exists():
+        raise ValueError(f"Could not find {dashboard_yaml}!")
+    db = DashComponentBase.from_yaml(dashboard_yaml, try_pickles, force_pickles,
+                                     mmap_mode=mmap_mode, cache_plan=cache_plan)
+    if isinstance(db, DashComponent):
+        db = DashApp(db, **dashapp_kwargs)
+    elif not isinstance(db, DashApp):
+        raise ValueError(f"{dashboard_yaml} should contain either a DashApp or a DashComponent, "
+                         f"not a {db.__class__.__name__}!")
+    return db
+
+# Cell
+
+def _figure_factories(db):
+    """returns list of all DashFigureFactory instances used by the components of db"""
+    factories, seen = [], set()
+    stack = [v for comp in db.dashboard_component._tree_components() for v in comp.__dict__.values()]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, DashFigureFactory) and id(obj) not in seen:
+            seen.add(id(obj))
+            factories.append(obj)
+            stack.extend(obj.__dict__.values())
+    return factories
+
+
+def warmup_dashboard(db, paths=("/", "/_dash-layout", "/_dash-dependencies")):
+    """Requests paths once with the flask test client, and renders the
+    default layout of the dashboard_component when the page layout gets rendered
+    per request (querystrings=True). This fills the @figure_cache caches
+    of the factories and the lazily built internals of dash and flask.
+
+    Args:
+        db (DashApp): the dashboard
+        paths (tuple): urls to request. Defaults to the index page, the layout
+            and the callback dependencies.
+
+    Returns:
+        dict with the status code of every path and the 'seconds' the warmup took
+    """
+    start = time.perf_counter()
+    result = {}
+    with db.flask_server().test_client() as client:
+        for path in paths:
+            result[path] = client.get(path).status_code
+    if db.querystrings and not db.cache_layout:
+        db.dashboard_component.layout(None)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+# Cell
+
+def reinit_after_fork(db):
+    """Re-initializes the fork-unsafe resources of db in a forked worker process:
+    the locks of all @figure_cache caches and the (shared) figure cache backend,
+    and the sqlite connections of a DiskCacheBackend."""
+    for factory in _figure_factories(db):
+        factory.after_fork()
+    backend = get_figure_cache_backend()
+    if backend is not None:
+        backend.after_fork()
+
+# Cell
+
+def create_app(dashboard_yaml="dashboard.yaml", try_pickles=False, force_pickles=False,
+               mmap_mode=None, cache_plan=True, warmup=True, freeze_gc=True,
+               deterministic_names=True, **dashapp_kwargs):
+    """WSGI application factory: loads the dashboard from dashboard_yaml,
+    warms it up and returns the flask server, e.g.:
+
+        $ gunicorn --preload -w 4 "dash_oop_components.wsgi:create_app('dashboard.yaml')"
+
+    With --preload all loading and warming up happens once in the gunicorn master
+    and gets shared copy-on-write with the workers. The fork-unsafe resources
+    get re-initialized in every worker with reinit_after_fork().
+
+    Without --preload every worker loads the dashboard itself. Subcomponents that
+    do not get passed a name then still get the same name (and so element id's)
+    in every worker, as create_app sets set_naming_mode('deterministic'),
+    so that callbacks work no matter which worker they end up at.
+
+    Args:
+        dashboard_yaml (str, Path): .yaml file generated with .to_yaml().
+            Defaults to 'dashboard.yaml'
+        try_pickles (bool): try to load DashFigureFactories from their filepath
+        force_pickles (bool): load DashFigureFactories from their filepath or raise
+        mmap_mode (str): memory-map the arrays and DataFrames of factories
+            that get loaded from file, see DashComponentBase.from_file()
+        cache_plan (bool): reuse the compiled ConfigPlan stored beside dashboard_yaml,
+            see load_dashboard(). Defaults to True.
+        warmup (bool): run warmup_dashboard() before returning. Defaults to True.
+        freeze_gc (bool): move all objects loaded so far into the permanent
+            generation of the garbage collector (gc.freeze()), so that they do not
+            get copied into the workers by garbage collections. Defaults to True.
+        deterministic_names (bool): set_naming_mode('deterministic') before loading,
+            so that every process that calls create_app generates the same element
+            id's. Defaults to True.
+        dashapp_kwargs: parameters for DashApp when dashboard_yaml stores a DashComponent
+
+    Returns:
+        flask.Flask: WSGI app
+    """
+    if deterministic_names:
+        set_naming_mode("deterministic")
+    db = load_dashboard(dashboard_yaml, try_pickles, force_pickles, mmap_mode, cache_plan, **dashapp_kwargs)
+    if warmup:
+        warmup_dashboard(db)
+    register_post_fork_hook(functools.partial(reinit_after_fork, db))
+    if freeze_gc and hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+    return db.flask_server()
\ No newline at end of file